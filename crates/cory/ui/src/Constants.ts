@@ -54,7 +54,11 @@ export const SIDEBAR_DEFAULT_WIDTH = 390;
 // ==============================================================================
 
 // Milliseconds of silence after the last keystroke before autosaving a label.
-export const AUTOSAVE_DEBOUNCE_MS = 2000;
+// The Playwright E2E suite sets `window.__AUTOSAVE_DEBOUNCE_MS` from an init
+// script (which runs before this module loads) so autosave cases do not sit
+// through the debounce on every edit.
+export const AUTOSAVE_DEBOUNCE_MS: number =
+  (window as Window & { __AUTOSAVE_DEBOUNCE_MS?: number }).__AUTOSAVE_DEBOUNCE_MS ?? 2000;
 
 // ==============================================================================
 // Graph Search Limits (UI-side defaults)
@@ -235,6 +235,7 @@ export default function GraphPanel() {
       {stats && (
         <div
           className="stats-chip"
+          data-testid="graph-stats"
           style={{
             position: "absolute",
             top: 10,
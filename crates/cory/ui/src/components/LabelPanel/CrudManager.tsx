@@ -231,7 +231,11 @@ export function CrudManager({
             spellCheck={false}
             style={{ flex: 1 }}
           />
-          <button className="btn-primary" onClick={() => void handleCreateFile()}>
+          <button
+            className="btn-primary"
+            data-testid="label-file-create"
+            onClick={() => void handleCreateFile()}
+          >
             Create
           </button>
         </div>
@@ -246,6 +250,7 @@ export function CrudManager({
           </button>
           <button
             className="btn-primary"
+            data-testid="label-files-export-all"
             onClick={() => void handleExportAllBrowserLabels()}
             style={{ fontSize: 11, padding: "4px 8px" }}
           >
@@ -300,6 +305,7 @@ export function CrudManager({
                   <div style={{ display: "flex", gap: 4 }}>
                     <button
                       className="btn-ghost"
+                      data-testid="label-file-export"
                       onClick={() => void handleExport(file)}
                       style={{ fontSize: 10, padding: "2px 6px" }}
                     >
@@ -307,6 +313,7 @@ export function CrudManager({
                     </button>
                     <button
                       className="btn-danger"
+                      data-testid="label-file-remove"
                       onClick={() => void handleDelete(file)}
                       style={{ fontSize: 10, padding: "2px 6px" }}
                     >
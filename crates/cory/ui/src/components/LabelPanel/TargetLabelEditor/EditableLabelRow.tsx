@@ -77,9 +77,12 @@ export function EditableLabelRow({
       <span style={editableFileTagStyle} title={entry.file_id}>
         {entry.file_name}
       </span>
+      {/* React sets `value` as a DOM property, which CSS cannot match; the
+          mirrored attribute lets E2E tests select a row by its label text. */}
       <input
         type="text"
         value={draft}
+        data-label-value={draft}
         onChange={(e) => handleChangeDraft(e.target.value)}
         autoComplete="off"
         spellCheck={false}
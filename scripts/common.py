@@ -1,20 +1,35 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import base64
+from collections import deque
 import datetime as dt
+import functools
+import hashlib
+import http.client
+import itertools
 import json
 import os
+import queue
+import random
 import re
 import socket
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 import shutil
 import subprocess
+import threading
 import time
-from typing import Any
-import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
 import urllib.parse
-import urllib.request
+
+try:
+    # Optional: orjson encodes and decodes the large createrawtransaction and
+    # decoderawtransaction payloads several times faster than the stdlib.
+    import orjson
+except ImportError:
+    orjson = None
 
 
 def log(msg: str) -> None:
@@ -28,6 +43,12 @@ def run(
     check: bool = True,
     env: dict[str, str] | None = None,
 ) -> subprocess.CompletedProcess[str]:
+    # Keep spawns free of `preexec_fn`, `shell=True` and credential changes so
+    # CPython stays on its vfork() fast path on Linux. The per-RPC spawns that
+    # made this matter are gone (RPC goes over HTTP), so the remaining
+    # handful of cargo/bitcoind launches do not justify the further
+    # restrictions posix_spawn needs (`close_fds=False`, absolute executable,
+    # no `cwd`).
     return subprocess.run(
         cmd,
         check=check,
@@ -50,37 +71,376 @@ class RegtestConfig:
     bitcoind_log: Path
 
 
+# Compact separators match orjson's output, so both paths produce the same
+# layout (only non-ASCII escaping differs).
+_json_compact = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def json_encode(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return _json_compact(value).encode("utf-8")
+
+
+def write_json_file(path: Path, value: Any, *, pretty: bool = True) -> None:
+    # Fixture files are indented by default so a failing run can be
+    # inspected by eye; `pretty=False` writes compact JSON, roughly half the
+    # bytes. orjson renders the whole document in C; the stdlib fallback
+    # streams into the file rather than building one large string first.
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else None
+        path.write_bytes(orjson.dumps(value, option=option))
+        return
+    # `json.dump` emits one small write per token; a 64 KiB buffer turns
+    # those into a few large writes for the multi-scenario fixtures.
+    with path.open("w", encoding="utf-8", buffering=1 << 16) as f:
+        if pretty:
+            json.dump(value, f, indent=2)
+        else:
+            json.dump(value, f, separators=(",", ":"))
+
+
+def json_decode(raw: bytes | str) -> Any:
+    # Both `json.JSONDecodeError` and `orjson.JSONDecodeError` subclass
+    # ValueError, which is what callers catch.
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# bitcoin-cli converts positional string arguments into JSON values for a
+# per-method set of parameter indices (its `vRPCConvertParams` table). We talk
+# JSON-RPC directly, so we mirror that table for the methods these scripts
+# call. Parameters not listed here are sent as JSON strings.
+# TODO: Extend this table when scripts start calling additional RPCs with
+# non-string parameters.
+CLI_JSON_PARAMS: dict[str, frozenset[int]] = {
+    "createrawtransaction": frozenset({0, 1, 2, 3}),
+    "createwallet": frozenset({1, 2, 4, 5, 6}),
+    "generatetoaddress": frozenset({0, 2}),
+    "getrawtransaction": frozenset({1}),
+    "sendmany": frozenset({1, 2, 4, 5, 6}),
+    "sendrawtransaction": frozenset({1, 2}),
+    "sendtoaddress": frozenset({1, 4, 5, 6, 9}),
+    "signrawtransactionwithwallet": frozenset({1}),
+}
+
+# Matches bitcoin-cli's default `-rpcclienttimeout`; mining many blocks or
+# large wallet operations can legitimately take a while on slow CI hosts.
+RPC_TIMEOUT_SEC = 900
+
+# Stays under bitcoind's default `-rpcworkqueue` (16) so concurrent calls wait
+# in the HTTP server queue instead of failing with "Work queue depth exceeded".
+RPC_POOL_WORKERS = 8
+
+# Verbose transactions are a few KB each; batches of this size keep each
+# buffered batch response small while still amortising the round-trip.
+TX_FETCH_BATCH_SIZE = 100
+
+
+class RpcError(RuntimeError):
+    """A JSON-RPC call was rejected by bitcoind."""
+
+    def __init__(self, method: str, code: int, message: str) -> None:
+        super().__init__(f"{method} failed ({code}): {message}")
+        self.method = method
+        self.code = code
+        self.message = message
+
+
 @dataclass
 class RegtestHandle:
     cfg: RegtestConfig
     bitcoind: subprocess.Popen[str]
     log_file: Any
+    _local: threading.local = field(init=False, repr=False)
+    _conns: list[http.client.HTTPConnection] = field(init=False, repr=False)
+    _conns_lock: threading.Lock = field(init=False, repr=False)
+    _pool: ThreadPoolExecutor | None = field(init=False, default=None, repr=False)
+    _pool_lock: threading.Lock = field(init=False, default_factory=threading.Lock, repr=False)
+    _rpc_headers: dict[str, str] = field(init=False, repr=False)
+    _ids: Iterator[int] = field(init=False, repr=False)
+    _tx_cache: dict[str, dict[str, Any]] = field(init=False, default_factory=dict, repr=False)
+    _mine_lock: threading.Lock = field(init=False, default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        # A keep-alive connection per thread replaces one `bitcoin-cli`
+        # fork/exec (plus TCP connect and auth) per call, which dominated the
+        # runtime of the funding and scenario-building loops.
+        self._local = threading.local()
+        self._conns = []
+        self._conns_lock = threading.Lock()
+        credentials = f"{self.cfg.rpc_user}:{self.cfg.rpc_pass}".encode("utf-8")
+        # Built once and shared by every request; `http.client` only reads it.
+        self._rpc_headers = {
+            "Authorization": "Basic " + base64.b64encode(credentials).decode("ascii"),
+            "Content-Type": "application/json",
+        }
+        # `next()` on `itertools.count` is atomic under the GIL, so request ids
+        # stay unique across `cli_many` worker threads.
+        self._ids = itertools.count(1)
+
+    def _conn(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection(
+                "127.0.0.1", self.cfg.rpc_port, timeout=RPC_TIMEOUT_SEC
+            )
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    def _send(
+        self, verb: str, path: str, body: bytes | None, headers: dict[str, str]
+    ) -> tuple[int, str, bytes]:
+        # bitcoind drops keep-alive connections that sit idle past
+        # `-rpcservertimeout`. Reusing such a socket fails when the request is
+        # written or before the first response byte arrives, and only that
+        # case is resent. It is not a general retry: the request bytes may
+        # have been written, so a resend is only sound because bitcoind never
+        # closes a connection mid-call except when it stops, and then the
+        # reconnect fails instead of running the call twice. A fresh
+        # connection, or a failure once the status line has arrived, raises.
+        conn = self._conn()
+        for attempt in range(2):
+            reused = conn.sock is not None
+            try:
+                conn.request(verb, path, body=body, headers=headers)
+                resp = conn.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                if not reused or attempt == 1:
+                    raise
+                continue
+            except (OSError, http.client.HTTPException):
+                # Reset the connection state machine so the next call (for
+                # example the next readiness probe) starts from a clean socket.
+                conn.close()
+                raise
+            try:
+                return resp.status, resp.reason, resp.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                raise
+        raise AssertionError("unreachable")
+
+    @staticmethod
+    @functools.cache
+    def _rpc_path(rpc_wallet: str | None) -> str:
+        # Scripts talk to a couple of fixed wallets, so each path is quoted once.
+        return f"/wallet/{urllib.parse.quote(rpc_wallet, safe='')}" if rpc_wallet else "/"
+
+    def _post(self, payload: Any, *, rpc_wallet: str | None) -> tuple[int, str, Any]:
+        status, reason, raw = self._send(
+            "POST", self._rpc_path(rpc_wallet), json_encode(payload), self._rpc_headers
+        )
+
+        # RPC errors arrive as HTTP 500/404 with a JSON body; auth failures
+        # and similar transport-level errors carry no JSON at all.
+        try:
+            return status, reason, json_decode(raw)
+        except ValueError:
+            return status, reason, None
+
+    def rest_tx(self, txid: str) -> dict[str, Any]:
+        """Fetch a transaction through bitcoind's REST interface.
+
+        `/rest/tx/<txid>.json` returns the same layout as verbose
+        `getrawtransaction` but skips JSON-RPC request parsing and dispatch,
+        which makes it the cheaper path for a single lookup. Failures such as
+        an unknown txid are raised as `RpcError` so callers handle both paths
+        alike.
+        """
+        status, reason, raw = self._send("GET", f"/rest/tx/{txid}.json", None, {})
+        if status != 200:
+            message = raw.decode("utf-8", "replace").strip() or reason
+            raise RpcError("rest/tx", status, message)
+        return json_decode(raw)
+
+    def _request(self, method: str, params: list[Any]) -> dict[str, Any]:
+        return {"jsonrpc": "1.0", "id": next(self._ids), "method": method, "params": params}
+
+    @staticmethod
+    def _unwrap(method: str, reply: dict[str, Any]) -> Any:
+        error = reply.get("error")
+        if error is not None:
+            raise RpcError(method, int(error.get("code", 0)), str(error.get("message", "")))
+        return reply.get("result")
+
+    def rpc(self, method: str, params: list[Any], *, rpc_wallet: str | None = None) -> Any:
+        status, reason, reply = self._post(self._request(method, params), rpc_wallet=rpc_wallet)
+        if not isinstance(reply, dict):
+            raise RpcError(method, status, f"HTTP {status} {reason}")
+        return self._unwrap(method, reply)
+
+    def rpc_batch(
+        self,
+        calls: list[tuple[str, list[Any]]],
+        *,
+        rpc_wallet: str | None = None,
+        return_errors: bool = False,
+    ) -> list[Any]:
+        """Send several calls in one JSON-RPC batch and return results in call order.
+
+        bitcoind buffers the whole batch response server-side, so callers
+        should keep batches bounded (a few hundred calls at most).
+
+        With `return_errors`, a rejected call yields its `RpcError` in place
+        of a result instead of raising, so one bad entry does not discard
+        the rest of the batch.
+        """
+        if not calls:
+            return []
+        requests = [self._request(method, params) for method, params in calls]
+        status, reason, replies = self._post(requests, rpc_wallet=rpc_wallet)
+        if not isinstance(replies, list):
+            raise RpcError(calls[0][0], status, f"HTTP {status} {reason}")
+
+        # The JSON-RPC spec does not promise response order, so match replies
+        # back to their requests by id.
+        by_id = {reply.get("id"): reply for reply in replies}
+        results = []
+        for request in requests:
+            reply = by_id.get(request["id"])
+            if reply is None:
+                raise RpcError(request["method"], 0, "missing reply in batch response")
+            try:
+                results.append(self._unwrap(request["method"], reply))
+            except RpcError as err:
+                if not return_errors:
+                    raise
+                results.append(err)
+        return results
+
+    def generate(self, blocks: int, address: str) -> list[str]:
+        # `generatetoaddress` builds each block on the tip it saw when it
+        # started, so two concurrent calls can mine sibling blocks and leave
+        # one set of transactions in a stale fork. Serialise mining across
+        # threads sharing this handle.
+        with self._mine_lock:
+            return self.rpc("generatetoaddress", [blocks, address])
 
     def cli(self, args: list[str], *, rpc_wallet: str | None = None) -> str:
-        base = [
-            "bitcoin-cli",
-            "-regtest",
-            f"-datadir={self.cfg.datadir}",
-            f"-rpcuser={self.cfg.rpc_user}",
-            f"-rpcpassword={self.cfg.rpc_pass}",
-            f"-rpcport={self.cfg.rpc_port}",
-        ]
-        if rpc_wallet:
-            base.append(f"-rpcwallet={rpc_wallet}")
-        cp = run(base + args, capture=True)
-        return cp.stdout.strip()
+        # Thin adapter that keeps the `bitcoin-cli` calling convention: string
+        # results are returned raw and structured results as JSON text.
+        result = self.cli_json(args, rpc_wallet=rpc_wallet)
+        if result is None:
+            return ""
+        if isinstance(result, str):
+            return result
+        return json_encode(result).decode("utf-8")
 
     def cli_json(self, args: list[str], *, rpc_wallet: str | None = None) -> Any:
-        out = self.cli(args, rpc_wallet=rpc_wallet)
-        if not out:
-            return None
-        return json.loads(out)
+        method, *raw_params = args
+        json_params = CLI_JSON_PARAMS.get(method, frozenset())
+        params = [
+            json_decode(value) if idx in json_params else value
+            for idx, value in enumerate(raw_params)
+        ]
+        return self.rpc(method, params, rpc_wallet=rpc_wallet)
+
+    def get_raw_tx(self, txid: str) -> dict[str, Any]:
+        """Return verbose `getrawtransaction` output, fetching each txid once.
+
+        A txid commits to its inputs and outputs, so `vin`/`vout` never change
+        once fetched. Confirmation fields (`confirmations`, `blockhash`) are
+        whatever they were at first fetch; callers here only read `vin`/`vout`.
+        """
+        tx = self._tx_cache.get(txid)
+        if tx is None:
+            tx = self.rest_tx(txid)
+            if not isinstance(tx, dict):
+                raise RuntimeError(f"unexpected getrawtransaction response for {txid}: {tx!r}")
+            self._tx_cache[txid] = tx
+        return tx
+
+    def get_raw_txs(self, txids: list[str]) -> list[dict[str, Any] | RpcError]:
+        """Like `get_raw_tx` for many txids, fetching all cache misses in one batch.
+
+        Unavailable transactions come back as their `RpcError` so callers can
+        skip them individually.
+        """
+        # No `blockhash` hint is passed: with `txindex=1` the lookup is one
+        # index read, and scenario transactions are nearly always cached from
+        # their own broadcast, so tracking per-tx block hashes would not pay.
+        missing = [txid for txid in dict.fromkeys(txids) if txid not in self._tx_cache]
+        # Large miss sets are split into bounded batches that go out
+        # concurrently, so neither one huge buffered response nor a serial
+        # chain of batches sets the pace.
+        chunks = [
+            missing[start : start + TX_FETCH_BATCH_SIZE]
+            for start in range(0, len(missing), TX_FETCH_BATCH_SIZE)
+        ]
+
+        def fetch(chunk: list[str]) -> list[Any]:
+            return self.rpc_batch(
+                [("getrawtransaction", [txid, True]) for txid in chunk], return_errors=True
+            )
+
+        if len(chunks) <= 1:
+            fetched = [result for chunk in chunks for result in fetch(chunk)]
+        else:
+            fetched = [
+                result for results in self._executor().map(fetch, chunks) for result in results
+            ]
+        errors: dict[str, RpcError] = {}
+        for txid, tx in zip(missing, fetched):
+            if isinstance(tx, RpcError):
+                errors[txid] = tx
+            elif not isinstance(tx, dict):
+                raise RuntimeError(f"unexpected getrawtransaction response for {txid}: {tx!r}")
+            else:
+                self._tx_cache[txid] = tx
+        return [errors[txid] if txid in errors else self._tx_cache[txid] for txid in txids]
+
+    def remember_txs(self, txs: list[dict[str, Any]]) -> None:
+        # Seed the cache with verbose transactions fetched in bulk elsewhere
+        # (for example through `cli_many`).
+        for tx in txs:
+            self._tx_cache[tx["txid"]] = tx
+
+    def cli_many(
+        self,
+        arg_lists: list[list[str]],
+        *,
+        rpc_wallet: str | None = None,
+    ) -> list[Any]:
+        """Run independent `cli_json` calls concurrently, returning results in order.
+
+        Unlike `rpc_batch`, each call gets its own reply as soon as bitcoind
+        finishes it, so slow calls do not hold back a buffered batch response.
+        Only use this for calls that do not depend on each other's effects.
+        """
+        if len(arg_lists) <= 1:
+            return [self.cli_json(args, rpc_wallet=rpc_wallet) for args in arg_lists]
+        return list(
+            self._executor().map(
+                lambda args: self.cli_json(args, rpc_wallet=rpc_wallet), arg_lists
+            )
+        )
+
+    def _executor(self) -> ThreadPoolExecutor:
+        # Created on first use; must not be used from its own worker threads,
+        # which could otherwise wait on work queued behind themselves.
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=RPC_POOL_WORKERS, thread_name_prefix="regtest-rpc"
+                )
+            return self._pool
 
     def stop(self) -> None:
         try:
-            self.cli(["stop"])
-        except subprocess.CalledProcessError:
+            self.rpc("stop", [])
+        except (RpcError, OSError, http.client.HTTPException):
             pass
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+        self._tx_cache.clear()
+        with self._conns_lock:
+            for conn in self._conns:
+                conn.close()
         try:
             self.bitcoind.wait(timeout=15)
         except subprocess.TimeoutExpired:
@@ -116,7 +476,24 @@ def make_config(root_dir: Path) -> RegtestConfig:
     )
 
 
-def start_bitcoind(cfg: RegtestConfig) -> RegtestHandle:
+# Readiness polling starts fast so an already-up service is detected within
+# tens of milliseconds, then backs off so a slow startup is not hammered.
+POLL_INITIAL_DELAY_SEC = 0.05
+POLL_MAX_DELAY_SEC = 1.0
+
+
+def next_poll_delay(delay: float) -> float:
+    # Jitter keeps concurrent pollers (for example several scripts starting
+    # at once on CI) from probing in lockstep.
+    return min(POLL_MAX_DELAY_SEC, delay * 2) * (1 + random.uniform(-0.2, 0.2))
+
+
+def start_bitcoind(cfg: RegtestConfig, *, seed_datadir: Path | None = None) -> RegtestHandle:
+    """Start a fresh regtest bitcoind, optionally from a copy of `seed_datadir`.
+
+    A seed is a datadir saved from a cleanly stopped node, so its chain,
+    wallets and mempool are reused instead of being rebuilt.
+    """
     log(f"run_id={cfg.run_id}")
     log(f"datadir={cfg.datadir}")
     if cfg.datadir.exists():
@@ -129,32 +506,48 @@ def start_bitcoind(cfg: RegtestConfig) -> RegtestHandle:
                 f"refusing to rmtree datadir outside tmp/: {resolved} "
                 f"(allowed parent: {allowed_parent})"
             )
-        shutil.rmtree(cfg.datadir)
-    cfg.datadir.mkdir(parents=True, exist_ok=True)
+        # `rm -rf` unlinks a populated datadir (blocks/, chainstate/,
+        # indexes/) noticeably faster than a Python-level tree walk; fall back
+        # to shutil where coreutils are not available.
+        if shutil.which("rm") is not None:
+            run(["rm", "-rf", "--", str(resolved)], capture=False)
+        else:
+            shutil.rmtree(resolved)
+    if seed_datadir is not None:
+        log(f"seeding datadir from {seed_datadir}")
+        shutil.copytree(seed_datadir, cfg.datadir)
+    else:
+        cfg.datadir.mkdir(parents=True, exist_ok=True)
 
-    conf = "\n".join(
-        [
-            "regtest=1",
-            "server=1",
-            "daemon=0",
-            "txindex=1",
-            "fallbackfee=0.0002",
-            f"rpcuser={cfg.rpc_user}",
-            f"rpcpassword={cfg.rpc_pass}",
-            "listen=0",
-            "dnsseed=0",
-            "discover=0",
-            "",
-            "[regtest]",
-            "rpcbind=127.0.0.1",
-            "rpcallowip=127.0.0.1",
-            f"rpcport={cfg.rpc_port}",
-            f"port={cfg.p2p_port}",
-            "",
-        ]
+    conf = (
+        "regtest=1\n"
+        "server=1\n"
+        "daemon=0\n"
+        "txindex=1\n"
+        # Unauthenticated read-only endpoints; `RegtestHandle.rest_tx` uses
+        # them for single transaction lookups. RPC stays bound to localhost.
+        "rest=1\n"
+        "fallbackfee=0.0002\n"
+        f"rpcuser={cfg.rpc_user}\n"
+        f"rpcpassword={cfg.rpc_pass}\n"
+        "listen=0\n"
+        "dnsseed=0\n"
+        "discover=0\n"
+        "\n"
+        "[regtest]\n"
+        "rpcbind=127.0.0.1\n"
+        "rpcallowip=127.0.0.1\n"
+        f"rpcport={cfg.rpc_port}\n"
+        f"port={cfg.p2p_port}\n"
     )
     conf_path = cfg.datadir / "bitcoin.conf"
-    conf_path.write_text(conf, encoding="utf-8")
+    # One open/write/close on a fresh descriptor. Mode 0600 because the file
+    # carries the RPC password.
+    fd = os.open(conf_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, conf.encode("utf-8"))
+    finally:
+        os.close(fd)
 
     log(f"starting bitcoind, log={cfg.bitcoind_log}")
     log_file = cfg.bitcoind_log.open("w", encoding="utf-8")
@@ -167,13 +560,19 @@ def start_bitcoind(cfg: RegtestConfig) -> RegtestHandle:
     handle = RegtestHandle(cfg=cfg, bitcoind=bitcoind, log_file=log_file)
 
     ready = False
-    for _ in range(60):
+    deadline = time.monotonic() + 60
+    delay = POLL_INITIAL_DELAY_SEC
+    while True:
         try:
-            handle.cli(["getblockchaininfo"])
+            handle.rpc("getblockchaininfo", [])
             ready = True
             break
-        except subprocess.CalledProcessError:
-            time.sleep(1)
+        except (RpcError, OSError, http.client.HTTPException):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            delay = next_poll_delay(delay)
     if not ready:
         handle.stop()
         raise RuntimeError("bitcoind RPC did not come up within 60s")
@@ -182,32 +581,46 @@ def start_bitcoind(cfg: RegtestConfig) -> RegtestHandle:
 
 
 def pick_free_port() -> int:
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.bind(("127.0.0.1", 0))
-    port = sock.getsockname()[1]
-    sock.close()
-    return port
+    # The probe socket only binds, never listens or connects, so closing it
+    # leaves no TIME_WAIT state and the real server can bind the port at
+    # once. The result is intentionally not cached: each caller needs its own
+    # port, and the probe is one syscall.
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
 
 
 def wait_for_health(base_url: str, timeout_sec: int = 30) -> None:
-    deadline = time.time() + timeout_sec
+    deadline = time.monotonic() + timeout_sec
+    delay = POLL_INITIAL_DELAY_SEC
     last_error: Exception | None = None
 
-    while time.time() < deadline:
-        try:
-            req = urllib.request.Request(f"{base_url}/api/v1/health", method="GET")
-            with urllib.request.urlopen(req, timeout=2) as resp:
-                body = json.loads(resp.read().decode("utf-8"))
+    # Reuse one keep-alive connection across probes instead of a fresh TCP
+    # handshake per attempt; http.client reconnects on its own after the
+    # socket is closed by a failed probe.
+    parts = urllib.parse.urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=2)
+    health_path = f"{parts.path.rstrip('/')}/api/v1/health"
+    try:
+        while time.monotonic() < deadline:
+            try:
+                conn.request("GET", health_path)
+                resp = conn.getresponse()
+                body = json_decode(resp.read())
                 if resp.status == 200 and body.get("status") == "ok":
                     return
-        except (urllib.error.URLError, TimeoutError, json.JSONDecodeError) as err:
-            last_error = err
-            time.sleep(0.5)
+            except (OSError, http.client.HTTPException, json.JSONDecodeError) as err:
+                last_error = err
+                conn.close()
+            time.sleep(max(0.0, min(delay, deadline - time.monotonic())))
+            delay = next_poll_delay(delay)
+    finally:
+        conn.close()
 
     raise RuntimeError(f"cory health check did not become ready in time: {last_error}")
 
 
-def stop_process(proc: subprocess.Popen[str], *, name: str, timeout_sec: int = 15) -> None:
+def stop_process(proc: subprocess.Popen[Any], *, name: str, timeout_sec: int = 15) -> None:
     if proc.poll() is not None:
         return
     log(f"stopping {name}")
@@ -219,6 +632,28 @@ def stop_process(proc: subprocess.Popen[str], *, name: str, timeout_sec: int = 1
         proc.wait(timeout=5)
 
 
+LOG_BUFFER_BYTES = 64 * 1024
+LOG_FLUSH_INTERVAL_SEC = 1.0
+
+# Startup banner lines printed by the cory server. Matched as bytes so the
+# stdout pump never has to decode build or server output.
+CORY_API_TOKEN_PAT = re.compile(rb"API token:\s+(\S+)")
+CORY_SAFE_URL_PAT = re.compile(rb"Safe URL:\s+(http://\S+)")
+
+
+def build_cory(root_dir: Path) -> None:
+    # Compiles the binary `start_cory` runs, for callers that cannot start
+    # cory until late in their setup (its arguments depend on generated
+    # files) but can overlap the possibly long build with that setup; the
+    # later `cargo run` then only checks freshness. `--manifest-path` keeps
+    # `run` free of `cwd`.
+    log("building cory")
+    run(
+        ["cargo", "build", "--manifest-path", str(root_dir / "Cargo.toml"), "--bin", "cory"],
+        capture=False,
+    )
+
+
 def start_cory(
     *,
     root_dir: Path,
@@ -230,7 +665,7 @@ def start_cory(
     log_path: Path,
     labels_rw: list[Path] | None = None,
     labels_ro: list[Path] | None = None,
-) -> tuple[subprocess.Popen[str], Any, str, str]:
+) -> tuple[subprocess.Popen[bytes], Any, str, str]:
     cmd = [
         "cargo",
         "run",
@@ -253,41 +688,79 @@ def start_cory(
     for path in labels_ro or []:
         cmd.extend(["--labels-ro", str(path)])
     log(f"starting cory server, log={log_path}")
-    log_file = log_path.open("w", encoding="utf-8")
+    # The pump thread copies cory's output line by line; a large write buffer
+    # with periodic flushes avoids one write syscall per line. Output stays as
+    # raw bytes end to end, so lines are never decoded just to be logged.
+    log_file = log_path.open("wb", buffering=LOG_BUFFER_BYTES)
     proc = subprocess.Popen(
         cmd,
         cwd=root_dir,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
     )
 
-    api_token_pat = re.compile(r"API token:\s+(\S+)")
-    safe_url_pat = re.compile(r"Safe URL:\s+(http://\S+)")
+    # A background thread blocks on `readline()` and hands lines to the main
+    # thread through a queue, so startup output is seen as soon as it is
+    # written instead of on the next 100ms poll. The thread keeps draining the
+    # pipe after startup as well; otherwise a chatty server would eventually
+    # block on a full stdout pipe once nobody reads it.
+    startup_lines: queue.Queue[bytes | None] = queue.Queue()
+    startup_done = threading.Event()
+
+    def pump_output() -> None:
+        assert proc.stdout is not None
+        last_flush = time.monotonic()
+        log_open = True
+        for line in iter(proc.stdout.readline, b""):
+            if log_open:
+                try:
+                    log_file.write(line)
+                    # Flush at most once per interval so `tail -f` on the log
+                    # still shows progress during a slow `cargo run` build.
+                    now = time.monotonic()
+                    if now - last_flush >= LOG_FLUSH_INTERVAL_SEC:
+                        log_file.flush()
+                        last_flush = now
+                except ValueError:
+                    # The caller closed the log during shutdown; keep draining
+                    # so cory never blocks on its stdout.
+                    log_open = False
+            if not startup_done.is_set():
+                startup_lines.put(line)
+        if log_open:
+            try:
+                log_file.flush()
+            except ValueError:
+                pass
+        startup_lines.put(None)
+
+    threading.Thread(target=pump_output, name="cory-stdout", daemon=True).start()
 
     url = None
     token = None
 
-    deadline = time.time() + 90
-    while time.time() < deadline:
-        if proc.poll() is not None:
-            raise RuntimeError(f"cory exited during startup with code {proc.returncode}")
-        line = proc.stdout.readline()
-        if line:
-            log_file.write(line)
-            log_file.flush()
-            if token is None:
-                token_match = api_token_pat.search(line)
-                if token_match:
-                    token = token_match.group(1).strip()
-            if url is None:
-                url_match = safe_url_pat.search(line)
-                if url_match:
-                    url = url_match.group(1).strip()
-            if url is not None and token is not None:
-                return proc, log_file, url, token
-        else:
-            time.sleep(0.1)
+    deadline = time.monotonic() + 90
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            line = startup_lines.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if line is None:
+            raise RuntimeError(f"cory exited during startup with code {proc.wait()}")
+        if token is None:
+            token_match = CORY_API_TOKEN_PAT.search(line)
+            if token_match:
+                token = token_match.group(1).decode("utf-8")
+        if url is None:
+            url_match = CORY_SAFE_URL_PAT.search(line)
+            if url_match:
+                url = url_match.group(1).decode("utf-8")
+        if url is not None and token is not None:
+            startup_done.set()
+            return proc, log_file, url, token
 
     raise RuntimeError("timed out waiting for cory startup output (Safe URL/API token)")
 
@@ -296,96 +769,349 @@ SATS_PER_BTC = 100_000_000
 PER_TX_FEE_SAT = 1_000
 MAX_INPUTS_PER_TX = 100
 MAX_OUTPUTS_PER_TX = 100
+# bitcoind's default `-limitancestorcount`/`-limitdescendantcount`: an
+# unconfirmed chain may hold at most this many transactions, the newest one
+# included. Chain builders mine once per full burst.
+MEMPOOL_ANCESTOR_CAP = 25
+# Seed funding puts every output into as few `sendmany` transactions as
+# possible. A P2WPKH output is 31 vB, so even a full batch stays around a third
+# of the 100 kvB standardness limit.
+FUNDING_OUTPUTS_PER_TX = 1_000
+
 
+@functools.lru_cache(maxsize=4096)
+def sat_to_btc(sats: int) -> str:
+    # Exact decimal string instead of a rounded float: bitcoind accepts JSON
+    # strings wherever it accepts amounts, and integer formatting cannot pick
+    # up binary floating-point artifacts. Fan-out, coinjoin and funding
+    # batches repeat the same few amounts many times, hence the cache.
+    if sats < 0:
+        raise ValueError(f"negative amount: {sats} sat")
+    whole, frac = divmod(sats, SATS_PER_BTC)
+    return f"{whole}.{frac:08d}"
 
-def sat_to_btc(sats: int) -> float:
-    return round(sats / SATS_PER_BTC, 8)
 
+def create_wallets(handle: RegtestHandle, *wallets: str) -> None:
+    # Wallet creation is independent per wallet, so every script's setup
+    # wallets are created in one batched round-trip.
+    handle.rpc_batch([("createwallet", [wallet]) for wallet in wallets])
 
-def mine_to_wallet(cli, *, wallet: str, blocks: int) -> str:
-    mine_addr = cli(["getnewaddress", "", "bech32"], rpc_wallet=wallet)
-    cli(["generatetoaddress", str(blocks), mine_addr])
+
+def mine_to_wallet(handle: RegtestHandle, *, wallet: str, blocks: int) -> str:
+    mine_addr = handle.rpc("getnewaddress", ["", "bech32"], rpc_wallet=wallet)
+    handle.generate(blocks, mine_addr)
     return mine_addr
 
 
+def new_addresses(handle: RegtestHandle, *, wallet: str, count: int) -> list[str]:
+    # One batched round-trip instead of `count` sequential `getnewaddress`
+    # calls. Callers keep `count` bounded by MAX_OUTPUTS_PER_TX or the funding
+    # batch size, which keeps bitcoind's buffered batch response small.
+    return handle.rpc_batch([("getnewaddress", ["", "bech32"])] * count, rpc_wallet=wallet)
+
+
+@dataclass
+class AddressPool:
+    """Receive addresses for one wallet, minted ahead of use in batches.
+
+    Safe to share between threads; a refill holds the lock for one batched
+    `getnewaddress` round-trip.
+    """
+
+    handle: RegtestHandle
+    wallet: str
+    refill_size: int = MAX_OUTPUTS_PER_TX
+    _addresses: deque[str] = field(init=False, default_factory=deque, repr=False)
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock, repr=False)
+
+    def take(self, count: int) -> list[str]:
+        with self._lock:
+            missing = count - len(self._addresses)
+            if missing > 0:
+                self._addresses.extend(
+                    new_addresses(
+                        self.handle,
+                        wallet=self.wallet,
+                        count=max(self.refill_size, missing),
+                    )
+                )
+            return [self._addresses.popleft() for _ in range(count)]
+
+
 def resolve_outpoints_for_addresses(
-    cli_json,
+    handle: RegtestHandle,
     txid: str,
     addresses: list[str],
     output_values: list[int],
+    *,
+    tx: dict[str, Any] | None = None,
 ) -> list[dict[str, Any]]:
-    tx = cli_json(["getrawtransaction", txid, "1"])
-    by_addr: dict[str, int] = {}
-    for out in tx.get("vout", []):
-        script = out.get("scriptPubKey", {})
-        addr = script.get("address")
-        if addr is not None:
-            by_addr[addr] = int(out["n"])
-
-    outpoints = []
-    for addr, value_sat in zip(addresses, output_values):
-        if addr not in by_addr:
-            raise RuntimeError(f"output address {addr} not found in tx {txid}")
-        outpoints.append(
+    if tx is None:
+        tx = handle.get_raw_tx(txid)
+    by_addr = {
+        out["scriptPubKey"]["address"]: out["n"]
+        for out in tx["vout"]
+        if "address" in out["scriptPubKey"]
+    }
+
+    # A single lookup per address; a missing address surfaces as KeyError
+    # instead of paying for an `in` check plus an index on every output.
+    try:
+        return [
             {
                 "txid": txid,
                 "vout": by_addr[addr],
                 "value_sat": value_sat,
                 "address": addr,
             }
-        )
-    return outpoints
+            for addr, value_sat in zip(addresses, output_values)
+        ]
+    except KeyError as err:
+        raise RuntimeError(f"output address {err.args[0]} not found in tx {txid}") from None
 
 
 def spend_inputs(
-    cli,
-    cli_json,
+    handle: RegtestHandle,
     *,
     wallet: str,
     inputs: list[dict[str, Any]],
     output_values: list[int],
+    dest_addrs: list[str] | None = None,
 ) -> tuple[str, list[dict[str, Any]]]:
-    if not inputs:
-        raise RuntimeError("inputs must not be empty")
-    if len(inputs) > MAX_INPUTS_PER_TX:
-        raise RuntimeError(
-            f"input count {len(inputs)} exceeds MAX_INPUTS_PER_TX={MAX_INPUTS_PER_TX}"
-        )
-    if len(output_values) > MAX_OUTPUTS_PER_TX:
+    [result] = spend_inputs_batch(
+        handle, wallet=wallet, spends=[(inputs, output_values)], dest_addrs=dest_addrs
+    )
+    return result
+
+
+def spend_inputs_batch(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    spends: list[tuple[list[dict[str, Any]], list[int]]],
+    dest_addrs: list[str] | None = None,
+) -> list[tuple[str, list[dict[str, Any]]]]:
+    """Build, sign and broadcast independent spends, one batched RPC per stage.
+
+    Every spend costs the same four round-trips as a single `spend_inputs`
+    call, however many spends there are. Spends must not consume each
+    other's outputs, because no output is known until the final stage.
+
+    `dest_addrs`, when given, supplies one address per output across all
+    spends in order (e.g. from an `AddressPool`) and saves the
+    `getnewaddress` round-trip.
+    """
+    for inputs, output_values in spends:
+        if not inputs:
+            raise RuntimeError("inputs must not be empty")
+        if len(inputs) > MAX_INPUTS_PER_TX:
+            raise RuntimeError(
+                f"input count {len(inputs)} exceeds MAX_INPUTS_PER_TX={MAX_INPUTS_PER_TX}"
+            )
+        if len(output_values) > MAX_OUTPUTS_PER_TX:
+            raise RuntimeError(
+                f"output count {len(output_values)} exceeds MAX_OUTPUTS_PER_TX={MAX_OUTPUTS_PER_TX}"
+            )
+
+        input_sum = sum(inp["value_sat"] for inp in inputs)
+        output_sum = sum(output_values)
+        if output_sum >= input_sum:
+            raise RuntimeError(
+                f"output_sum={output_sum} must be less than input_sum={input_sum}"
+            )
+
+    output_count = sum(len(values) for _inputs, values in spends)
+    if dest_addrs is None:
+        all_addresses = new_addresses(handle, wallet=wallet, count=output_count)
+    elif len(dest_addrs) != output_count:
         raise RuntimeError(
-            f"output count {len(output_values)} exceeds MAX_OUTPUTS_PER_TX={MAX_OUTPUTS_PER_TX}"
+            f"got {len(dest_addrs)} destination addresses for {output_count} outputs"
         )
+    else:
+        all_addresses = dest_addrs
+    addresses_per_spend: list[list[str]] = []
+    offset = 0
+    for _inputs, output_values in spends:
+        addresses_per_spend.append(all_addresses[offset : offset + len(output_values)])
+        offset += len(output_values)
 
-    input_sum = sum(inp["value_sat"] for inp in inputs)
-    output_sum = sum(output_values)
-    if output_sum >= input_sum:
-        raise RuntimeError(f"output_sum={output_sum} must be less than input_sum={input_sum}")
+    # Structured params go straight onto the wire; the `cli()` adapter would
+    # serialise them to strings only to parse them back again.
+    raw_hexes = handle.rpc_batch(
+        [
+            (
+                "createrawtransaction",
+                [
+                    [{"txid": inp["txid"], "vout": inp["vout"]} for inp in inputs],
+                    {addr: sat_to_btc(sats) for addr, sats in zip(addresses, output_values)},
+                ],
+            )
+            for (inputs, output_values), addresses in zip(spends, addresses_per_spend)
+        ],
+        rpc_wallet=wallet,
+    )
+    signed_txs = handle.rpc_batch(
+        [("signrawtransactionwithwallet", [raw_hex]) for raw_hex in raw_hexes],
+        rpc_wallet=wallet,
+    )
+    if not all(signed.get("complete") for signed in signed_txs):
+        raise RuntimeError("signrawtransactionwithwallet returned incomplete=false")
 
-    addresses = [
-        cli(["getnewaddress", "", "bech32"], rpc_wallet=wallet)
-        for _ in output_values
+    # Decoding the signed hex yields the same `vin`/`vout` layout as verbose
+    # `getrawtransaction`, so it rides along with the broadcast instead of
+    # costing a separate lookup afterwards. The decode is a pure local
+    # operation and does not depend on the mempool or txindex.
+    replies = handle.rpc_batch(
+        [
+            call
+            for signed in signed_txs
+            for call in (
+                ("sendrawtransaction", [signed["hex"]]),
+                ("decoderawtransaction", [signed["hex"]]),
+            )
+        ],
+        rpc_wallet=wallet,
+    )
+    txids, txs = replies[0::2], replies[1::2]
+    handle.remember_txs(txs)
+    return [
+        (
+            txid,
+            resolve_outpoints_for_addresses(handle, txid, addresses, output_values, tx=tx),
+        )
+        for txid, tx, addresses, (_inputs, output_values) in zip(
+            txids, txs, addresses_per_spend, spends
+        )
     ]
-    raw_inputs = [{"txid": inp["txid"], "vout": inp["vout"]} for inp in inputs]
-    raw_outputs = {addr: sat_to_btc(sats) for addr, sats in zip(addresses, output_values)}
 
-    raw_hex = cli(
-        ["createrawtransaction", json.dumps(raw_inputs), json.dumps(raw_outputs)],
+
+def spend_one_to_one(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    utxo: dict[str, Any],
+    dest_addr: str,
+    fee_sat: int = PER_TX_FEE_SAT,
+) -> tuple[str, dict[str, Any]]:
+    """Spend one outpoint to one address and return `(txid, next_utxo)`.
+
+    Fast path for chain hops. `createrawtransaction` keeps outputs in the
+    order given, so the only output is always vout 0 and the next outpoint
+    is known without decoding the transaction. The tx cache is not seeded;
+    the few hops later used for labels are fetched in one batch.
+    """
+    value_sat = utxo["value_sat"] - fee_sat
+    if value_sat <= 0:
+        raise RuntimeError(f"fee_sat={fee_sat} exceeds input value {utxo['value_sat']}")
+    raw_hex = handle.rpc(
+        "createrawtransaction",
+        [[{"txid": utxo["txid"], "vout": utxo["vout"]}], {dest_addr: sat_to_btc(value_sat)}],
         rpc_wallet=wallet,
     )
-    signed = cli_json(["signrawtransactionwithwallet", raw_hex], rpc_wallet=wallet)
+    signed = handle.rpc("signrawtransactionwithwallet", [raw_hex], rpc_wallet=wallet)
     if not signed.get("complete"):
         raise RuntimeError("signrawtransactionwithwallet returned incomplete=false")
+    txid = handle.rpc("sendrawtransaction", [signed["hex"]], rpc_wallet=wallet)
+    return txid, {"txid": txid, "vout": 0, "value_sat": value_sat, "address": dest_addr}
+
 
-    txid = cli(["sendrawtransaction", signed["hex"]], rpc_wallet=wallet)
-    outpoints = resolve_outpoints_for_addresses(
-        cli_json, txid, addresses, output_values
+def _unsigned_one_to_one(
+    prev_txid: str, prev_vout: int, script_pubkey: bytes, value_sat: int
+) -> bytes:
+    # Legacy (witness-free) serialization: version 2, one input with an
+    # empty scriptSig and final sequence, one output, locktime 0; the same
+    # layout `createrawtransaction` produces for this spend.
+    return b"".join(
+        (
+            (2).to_bytes(4, "little"),
+            b"\x01",
+            bytes.fromhex(prev_txid)[::-1],
+            prev_vout.to_bytes(4, "little"),
+            b"\x00",
+            b"\xff\xff\xff\xff",
+            b"\x01",
+            value_sat.to_bytes(8, "little"),
+            len(script_pubkey).to_bytes(1, "little"),
+            script_pubkey,
+            (0).to_bytes(4, "little"),
+        )
     )
-    return txid, outpoints
+
+
+def spend_chain(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    seed: dict[str, Any],
+    dest_addrs: list[str],
+    mine_addr: str,
+    fee_sat: int = PER_TX_FEE_SAT,
+) -> list[str]:
+    """Spend `seed` through one one-in-one-out hop per address; return the txids.
+
+    Hops must pay to segwit addresses. A segwit txid does not cover the
+    witness, so every hop's txid is known from its unsigned serialization
+    before anything is signed or broadcast. That lets the whole chain be
+    drafted locally, signed in one batch (the unbroadcast parents are passed
+    as `prevtxs`), and broadcast in bursts of MEMPOOL_ANCESTOR_CAP with a
+    block between bursts. The last burst is left unconfirmed for the caller.
+    """
+    final_value = seed["value_sat"] - fee_sat * len(dest_addrs)
+    if final_value <= 0:
+        raise RuntimeError(
+            f"{len(dest_addrs)} hops at fee_sat={fee_sat} exceed input value {seed['value_sat']}"
+        )
+    infos = handle.rpc_batch(
+        [("validateaddress", [addr]) for addr in [seed["address"], *dest_addrs]]
+    )
+    scripts = [info["scriptPubKey"] for info in infos]
+
+    prev = {"txid": seed["txid"], "vout": seed["vout"], "value_sat": seed["value_sat"]}
+    unsigned_hexes: list[str] = []
+    prevtxs: list[dict[str, Any]] = []
+    txids: list[str] = []
+    for prev_script, script in zip(scripts, scripts[1:]):
+        value_sat = prev["value_sat"] - fee_sat
+        raw = _unsigned_one_to_one(prev["txid"], prev["vout"], bytes.fromhex(script), value_sat)
+        txid = hashlib.sha256(hashlib.sha256(raw).digest()).digest()[::-1].hex()
+        unsigned_hexes.append(raw.hex())
+        prevtxs.append(
+            {
+                "txid": prev["txid"],
+                "vout": prev["vout"],
+                "scriptPubKey": prev_script,
+                "amount": sat_to_btc(prev["value_sat"]),
+            }
+        )
+        txids.append(txid)
+        prev = {"txid": txid, "vout": 0, "value_sat": value_sat}
+
+    signed = handle.rpc_batch(
+        [
+            ("signrawtransactionwithwallet", [raw_hex, [prevtx]])
+            for raw_hex, prevtx in zip(unsigned_hexes, prevtxs)
+        ],
+        rpc_wallet=wallet,
+    )
+    if not all(entry.get("complete") for entry in signed):
+        raise RuntimeError("signrawtransactionwithwallet returned incomplete=false")
+
+    # bitcoind runs batch entries in order, so each hop sees its parent in
+    # the mempool.
+    for start in range(0, len(signed), MEMPOOL_ANCESTOR_CAP):
+        if start:
+            handle.generate(1, mine_addr)
+        burst = signed[start : start + MEMPOOL_ANCESTOR_CAP]
+        sent = handle.rpc_batch(
+            [("sendrawtransaction", [entry["hex"]]) for entry in burst], rpc_wallet=wallet
+        )
+        if sent != txids[start : start + len(burst)]:
+            raise RuntimeError("broadcast txids differ from the locally computed chain")
+    return txids
 
 
 def fund_wallet_utxos(
-    cli,
-    cli_json,
+    handle: RegtestHandle,
     *,
     source_wallet: str,
     dest_wallet: str,
@@ -393,44 +1119,80 @@ def fund_wallet_utxos(
     value_sat: int,
     mine_addr: str,
 ) -> list[dict[str, Any]]:
+    """Fund `count` outputs of `value_sat` each in `dest_wallet`, confirmed.
+
+    Every round mines a block, so funding must finish before pooled scenario
+    builders start using the handle; otherwise those blocks would land in
+    the middle of their mempool-sensitive broadcasts.
+    """
     outpoints: list[dict[str, Any]] = []
-    batch_size = 80
-
-    remaining = count
-    while remaining > 0:
-        batch_count = min(batch_size, remaining)
-        addrs = [
-            cli(["getnewaddress", "", "bech32"], rpc_wallet=dest_wallet)
-            for _ in range(batch_count)
-        ]
-        outputs = {addr: sat_to_btc(value_sat) for addr in addrs}
+    batch_size = FUNDING_OUTPUTS_PER_TX
+    batch_counts = [min(batch_size, count - start) for start in range(0, count, batch_size)]
+
+    # Up to MEMPOOL_ANCESTOR_CAP funding transactions go out per round: one
+    # batched `getnewaddress`, one batched `sendmany`, then one block plus
+    # every fetch in a single POST. Later sends may spend earlier change, so
+    # the cap keeps that chain inside the mempool limits.
+    for start in range(0, len(batch_counts), MEMPOOL_ANCESTOR_CAP):
+        round_counts = batch_counts[start : start + MEMPOOL_ANCESTOR_CAP]
+        round_addrs = new_addresses(handle, wallet=dest_wallet, count=sum(round_counts))
+        addr_batches: list[list[str]] = []
+        offset = 0
+        for batch_count in round_counts:
+            addr_batches.append(round_addrs[offset : offset + batch_count])
+            offset += batch_count
 
-        txid = cli(
-            ["sendmany", "", json.dumps(outputs), "1", "", "[]", "true"],
+        txids = handle.rpc_batch(
+            [
+                (
+                    "sendmany",
+                    ["", {addr: sat_to_btc(value_sat) for addr in addrs}, 1, "", [], True],
+                )
+                for addrs in addr_batches
+            ],
             rpc_wallet=source_wallet,
         )
-        cli(["generatetoaddress", "1", mine_addr])
-
-        outpoints.extend(
-            resolve_outpoints_for_addresses(
-                cli_json,
-                txid,
-                addrs,
-                [value_sat for _ in range(batch_count)],
+        # bitcoind executes batch entries in order, so the fetches observe
+        # the freshly mined block. The block is mined inside the batch rather
+        # than through `handle.generate`, so the handle's mine lock is taken
+        # here to keep it from racing another thread's `generate`.
+        with handle._mine_lock:
+            _block_hashes, *txs = handle.rpc_batch(
+                [("generatetoaddress", [1, mine_addr])]
+                + [("getrawtransaction", [txid, True]) for txid in txids]
+            )
+        handle.remember_txs(txs)
+
+        for txid, tx, addrs in zip(txids, txs, addr_batches):
+            outpoints.extend(
+                resolve_outpoints_for_addresses(
+                    handle,
+                    txid,
+                    addrs,
+                    [value_sat] * len(addrs),
+                    tx=tx,
+                )
             )
-        )
-        remaining -= batch_count
 
     return outpoints
 
 
+@functools.cache
+def base_env() -> dict[str, str]:
+    # Snapshot the parent environment once; these scripts never modify
+    # `os.environ` after startup. Callers must not mutate the returned dict.
+    return os.environ.copy()
+
+
 def rust_test_env(cfg: RegtestConfig) -> dict[str, str]:
-    env = os.environ.copy()
-    env["CORY_TEST_RPC_URL"] = f"http://127.0.0.1:{cfg.rpc_port}"
-    env["CORY_TEST_RPC_USER"] = cfg.rpc_user
-    env["CORY_TEST_RPC_PASS"] = cfg.rpc_pass
-    env.setdefault("RUST_LOG", "cory_core=trace")
-    return env
+    base = base_env()
+    return {
+        **base,
+        "CORY_TEST_RPC_URL": f"http://127.0.0.1:{cfg.rpc_port}",
+        "CORY_TEST_RPC_USER": cfg.rpc_user,
+        "CORY_TEST_RPC_PASS": cfg.rpc_pass,
+        "RUST_LOG": base.get("RUST_LOG", "cory_core=trace"),
+    }
 
 
 def run_ignored_rust_test(
@@ -458,6 +1220,9 @@ def run_ignored_rust_test_in_package(
     if extra_env:
         env.update(extra_env)
     log(f"running cargo integration test {package}/{test_name} with --nocapture")
+    # cargo inherits our stdout/stderr (`capture=False`) so progress streams
+    # straight to the terminal and nothing is buffered in this process, no
+    # matter how much the test prints.
     run(
         [
             "cargo",
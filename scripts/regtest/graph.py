@@ -1,79 +1,172 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import os
 from pathlib import Path
 import sys
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from common import (
     MAX_INPUTS_PER_TX,
     MAX_OUTPUTS_PER_TX,
+    MEMPOOL_ANCESTOR_CAP,
     PER_TX_FEE_SAT,
+    AddressPool,
+    RegtestHandle,
+    create_wallets,
     fund_wallet_utxos,
     log,
     make_config,
     mine_to_wallet,
     run_ignored_rust_test,
     spend_inputs,
+    spend_inputs_batch,
     start_bitcoind,
+    write_json_file,
 )
 
+# Scenario builders run concurrently, each on its own keep-alive connection.
+# Four matches the oldest `-rpcthreads` default, so no call waits behind
+# another builder's in bitcoind's work queue.
+SCENARIO_WORKERS = 4
 
-def chunked(items: list[dict[str, Any]], size: int) -> list[list[dict[str, Any]]]:
-    return [items[i : i + size] for i in range(0, len(items), size)]
+# Traversal limits for the functional scenarios; stress limits scale with the
+# stress target and are computed per run. Emitted as copies so no scenario
+# can alias another's limits.
+LIMITS_SMALL = {"max_depth": 6, "max_nodes": 512, "max_edges": 2048}
+LIMITS_WIDE = {"max_depth": 6, "max_nodes": 2048, "max_edges": 8192}
+LIMITS_NODE_TRUNCATION = {"max_depth": 10, "max_nodes": 5, "max_edges": 8192}
+LIMITS_EDGE_TRUNCATION = {"max_depth": 10, "max_nodes": 8192, "max_edges": 10}
+LIMITS_DEEP_FULL = {"max_depth": 60, "max_nodes": 4096, "max_edges": 8192}
+LIMITS_DEEP_DEPTH_LIMITED = {"max_depth": 10, "max_nodes": 4096, "max_edges": 8192}
+LIMITS_PREVOUT_GAP = {"max_depth": 0, "max_nodes": 64, "max_edges": 256}
+
+
+def chunked(items: list[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
 
 
 def compress_to_single_outpoint(
-    cli,
-    cli_json,
+    handle: RegtestHandle,
     *,
     wallet: str,
     mine_wallet: str,
+    address_pool: AddressPool,
     outpoints: list[dict[str, Any]],
+    total_value_sat: int | None = None,
 ) -> tuple[str, list[dict[str, Any]], list[dict[str, Any]]]:
     if not outpoints:
         raise RuntimeError("outpoints must not be empty")
+    # Callers that built `outpoints` themselves usually already know the
+    # total; after that it is tracked per round from the group totals rather
+    # than re-summed from the outpoint dicts.
+    if total_value_sat is None:
+        total_value_sat = sum(o["value_sat"] for o in outpoints)
     if len(outpoints) <= MAX_INPUTS_PER_TX:
         txid, final_outs = spend_inputs(
-            cli,
-            cli_json,
+            handle,
             wallet=wallet,
             inputs=outpoints,
-            output_values=[sum(o["value_sat"] for o in outpoints) - PER_TX_FEE_SAT],
+            output_values=[total_value_sat - PER_TX_FEE_SAT],
+            dest_addrs=address_pool.take(1),
         )
         return txid, final_outs, outpoints
 
     current = outpoints
     while len(current) > MAX_INPUTS_PER_TX:
-        next_round: list[dict[str, Any]] = []
-        groups = chunked(current, MAX_INPUTS_PER_TX)
-        for group in groups:
-            txid, outs = spend_inputs(
-                cli,
-                cli_json,
-                wallet=wallet,
-                inputs=group,
-                output_values=[sum(o["value_sat"] for o in group) - PER_TX_FEE_SAT],
-            )
-            _ = txid
-            next_round.extend(outs)
-        current = next_round
-        mine_to_wallet(cli, wallet=mine_wallet, blocks=1)
+        # All groups of a round are independent, so their spends are
+        # pipelined through one batched call per stage, followed by a single
+        # block to confirm the round before the next one spends it.
+        spends = [
+            (group, [sum(o["value_sat"] for o in group) - PER_TX_FEE_SAT])
+            for group in chunked(current, MAX_INPUTS_PER_TX)
+        ]
+        spent = spend_inputs_batch(
+            handle,
+            wallet=wallet,
+            spends=spends,
+            dest_addrs=address_pool.take(len(spends)),
+        )
+        current = [out for _txid, outs in spent for out in outs]
+        total_value_sat -= PER_TX_FEE_SAT * len(spends)
+        mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
 
     txid, final_outs = spend_inputs(
-        cli,
-        cli_json,
+        handle,
         wallet=wallet,
         inputs=current,
-        output_values=[sum(o["value_sat"] for o in current) - PER_TX_FEE_SAT],
+        output_values=[total_value_sat - PER_TX_FEE_SAT],
+        dest_addrs=address_pool.take(1),
     )
     return txid, final_outs, current
 
 
+def required_edge(
+    spending_txid: str, input_index: int, funding_txid: str, funding_vout: int
+) -> dict[str, Any]:
+    return {
+        "spending_txid": spending_txid,
+        "input_index": input_index,
+        "funding_txid": funding_txid,
+        "funding_vout": funding_vout,
+    }
+
+
+def fan_in_edges(
+    spending_txid: str, funding_outs: list[dict[str, Any]], *, sampled: bool = False
+) -> list[dict[str, Any]]:
+    """Required edges from `funding_outs` into `spending_txid`, which spent them in order.
+
+    `sampled` keeps only the first, middle and last input so wide roots do
+    not bloat the fixture with hundreds of edges.
+    """
+    indices: Iterable[int] = range(len(funding_outs))
+    if sampled:
+        indices = sorted({0, len(funding_outs) // 2, len(funding_outs) - 1})
+    return [
+        required_edge(
+            spending_txid, index, funding_outs[index]["txid"], funding_outs[index]["vout"]
+        )
+        for index in indices
+    ]
+
+
+def spend_each_seed(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    address_pool: AddressPool,
+    seeds: list[dict[str, Any]],
+    progress_label: str | None = None,
+) -> tuple[list[dict[str, Any]], int]:
+    """Spend every seed into its own 1-in-1-out transaction.
+
+    The spends are independent, so they go out through `spend_inputs_batch`
+    a hundred at a time. Returns the new outpoints in seed order and their
+    total value.
+    """
+    outpoints: list[dict[str, Any]] = []
+    total_value_sat = 0
+    for batch in chunked(seeds, MAX_OUTPUTS_PER_TX):
+        values = [utxo["value_sat"] - 1_000 for utxo in batch]
+        spent = spend_inputs_batch(
+            handle,
+            wallet=wallet,
+            spends=[([utxo], [value]) for utxo, value in zip(batch, values)],
+            dest_addrs=address_pool.take(len(batch)),
+        )
+        outpoints.extend(out for _txid, outs in spent for out in outs)
+        total_value_sat += sum(values)
+        if progress_label is not None:
+            log(f"{progress_label}: {len(outpoints)}/{len(seeds)}")
+    return outpoints, total_value_sat
+
+
 def required_seed_utxos(tier: str, stress_target: int) -> int:
     functional_budget = 56
     stress_budget = stress_target + 24
@@ -84,474 +177,463 @@ def required_seed_utxos(tier: str, stress_target: int) -> int:
     return functional_budget + stress_budget
 
 
-def build_fixture_scenarios(
+def build_small_chain_3(
+    handle: RegtestHandle,
     *,
-    cli,
-    cli_json,
-    wallet_graph: str,
-    wallet_miner: str,
-    mine_addr: str,
-    stress_target: int,
-    tier: str,
+    wallet: str,
+    mine_wallet: str,
+    address_pool: AddressPool,
+    seed: dict[str, Any],
 ) -> list[dict[str, Any]]:
-    utxos_needed = required_seed_utxos(tier, stress_target)
-    log(f"funding {utxos_needed} seed UTXOs for tier={tier}")
-    utxos = fund_wallet_utxos(
-        cli,
-        cli_json,
-        source_wallet=wallet_miner,
-        dest_wallet=wallet_graph,
-        count=utxos_needed,
-        value_sat=100_000_000,
-        mine_addr=mine_addr,
+    tx1, o1 = spend_inputs(
+        handle,
+        wallet=wallet,
+        inputs=[seed],
+        output_values=[seed["value_sat"] - 1_000],
+        dest_addrs=address_pool.take(1),
     )
+    tx2, o2 = spend_inputs(
+        handle,
+        wallet=wallet,
+        inputs=o1,
+        output_values=[o1[0]["value_sat"] - 1_000],
+        dest_addrs=address_pool.take(1),
+    )
+    tx3, _o3 = spend_inputs(
+        handle,
+        wallet=wallet,
+        inputs=o2,
+        output_values=[o2[0]["value_sat"] - 1_000],
+        dest_addrs=address_pool.take(1),
+    )
+    mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
+
+    return [
+        {
+            "name": "small_chain_3",
+            "tier": "functional",
+            "root_txid": tx3,
+            "limits": dict(LIMITS_SMALL),
+            "expect_truncated": False,
+            "required_nodes": [tx3, tx2, tx1],
+            "required_edges": [
+                required_edge(tx3, 0, tx2, o2[0]["vout"]),
+                required_edge(tx2, 0, tx1, o1[0]["vout"]),
+            ],
+        }
+    ]
 
-    def take_utxo() -> dict[str, Any]:
-        if not utxos:
-            raise RuntimeError("not enough funded UTXOs for scenario generation")
-        return utxos.pop(0)
-
-    scenarios: list[dict[str, Any]] = []
-
-    if tier in {"all", "functional"}:
-        # small_chain_3
-        u0 = take_utxo()
-        tx1, o1 = spend_inputs(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
-            inputs=[u0],
-            output_values=[u0["value_sat"] - 1_000],
-        )
-        tx2, o2 = spend_inputs(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
-            inputs=o1,
-            output_values=[o1[0]["value_sat"] - 1_000],
-        )
-        tx3, _o3 = spend_inputs(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
-            inputs=o2,
-            output_values=[o2[0]["value_sat"] - 1_000],
-        )
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-
-        limits = {"max_depth": 6, "max_nodes": 512, "max_edges": 2048}
-        scenarios.append(
-            {
-                "name": "small_chain_3",
-                "tier": "functional",
-                "root_txid": tx3,
-                "limits": limits,
-                "expect_truncated": False,
-                "required_nodes": [tx3, tx2, tx1],
-                "required_edges": [
-                    {
-                        "spending_txid": tx3,
-                        "input_index": 0,
-                        "funding_txid": tx2,
-                        "funding_vout": o2[0]["vout"],
-                    },
-                    {
-                        "spending_txid": tx2,
-                        "input_index": 0,
-                        "funding_txid": tx1,
-                        "funding_vout": o1[0]["vout"],
-                    },
-                ],
-            }
-        )
-
-        # merge_parent_double_input
-        u1 = take_utxo()
-        parent_txid, parent_outs = spend_inputs(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
-            inputs=[u1],
-            output_values=[40_000_000, 59_999_000],
-        )
-        root_txid, _root_outs = spend_inputs(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
-            inputs=parent_outs,
-            output_values=[99_997_000],
-        )
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-
-        limits = {"max_depth": 6, "max_nodes": 512, "max_edges": 2048}
-        scenarios.append(
-            {
-                "name": "merge_parent_double_input",
-                "tier": "functional",
-                "root_txid": root_txid,
-                "limits": limits,
-                "expect_truncated": False,
-                "required_nodes": [root_txid, parent_txid],
-                "required_edges": [
-                    {
-                        "spending_txid": root_txid,
-                        "input_index": 0,
-                        "funding_txid": parent_txid,
-                        "funding_vout": parent_outs[0]["vout"],
-                    },
-                    {
-                        "spending_txid": root_txid,
-                        "input_index": 1,
-                        "funding_txid": parent_txid,
-                        "funding_vout": parent_outs[1]["vout"],
-                    },
-                ],
-            }
-        )
 
-        # wide_frontier_32 (mine parents before root to avoid mempool ancestor limits)
-        wide_inputs = [take_utxo() for _ in range(32)]
-        parent_outs: list[dict[str, Any]] = []
-        for utxo in wide_inputs:
-            _txid, outs = spend_inputs(
-                cli,
-                cli_json,
-                wallet=wallet_graph,
-                inputs=[utxo],
-                output_values=[utxo["value_sat"] - 1_000],
-            )
-            parent_outs.extend(outs)
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-
-        wide_root, _wide_root_outs = spend_inputs(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
-            inputs=parent_outs,
-            output_values=[sum(o["value_sat"] for o in parent_outs) - 32_000],
-        )
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-
-        limits = {"max_depth": 6, "max_nodes": 2048, "max_edges": 8192}
-        scenarios.append(
-            {
-                "name": "wide_frontier_32",
-                "tier": "functional",
-                "root_txid": wide_root,
-                "limits": limits,
-                "expect_truncated": False,
-                "required_nodes": [wide_root],
-                "required_edges": [
-                    {
-                        "spending_txid": wide_root,
-                        "input_index": 0,
-                        "funding_txid": parent_outs[0]["txid"],
-                        "funding_vout": parent_outs[0]["vout"],
-                    },
-                    {
-                        "spending_txid": wide_root,
-                        "input_index": 31,
-                        "funding_txid": parent_outs[31]["txid"],
-                        "funding_vout": parent_outs[31]["vout"],
-                    },
-                ],
-            }
-        )
+def build_merge_parent_double_input(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    mine_wallet: str,
+    address_pool: AddressPool,
+    seed: dict[str, Any],
+) -> list[dict[str, Any]]:
+    parent_txid, parent_outs = spend_inputs(
+        handle,
+        wallet=wallet,
+        inputs=[seed],
+        output_values=[40_000_000, 59_999_000],
+        dest_addrs=address_pool.take(2),
+    )
+    root_txid, _root_outs = spend_inputs(
+        handle,
+        wallet=wallet,
+        inputs=parent_outs,
+        output_values=[99_997_000],
+        dest_addrs=address_pool.take(1),
+    )
+    mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
+
+    return [
+        {
+            "name": "merge_parent_double_input",
+            "tier": "functional",
+            "root_txid": root_txid,
+            "limits": dict(LIMITS_SMALL),
+            "expect_truncated": False,
+            "required_nodes": [root_txid, parent_txid],
+            "required_edges": fan_in_edges(root_txid, parent_outs),
+        }
+    ]
 
-        # deep_chain_near_limit (40 tx chain)
-        u2 = take_utxo()
-        chain_out = [u2]
-        chain_txids: list[str] = []
-        for i in range(40):
-            txid, chain_out = spend_inputs(
-                cli,
-                cli_json,
-                wallet=wallet_graph,
-                inputs=chain_out,
-                output_values=[chain_out[0]["value_sat"] - 1_000],
-            )
-            chain_txids.append(txid)
-            if (i + 1) % 20 == 0:
-                mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-
-        deep_root = chain_txids[-1]
-        limits_full = {"max_depth": 60, "max_nodes": 4096, "max_edges": 8192}
-        scenarios.append(
-            {
-                "name": "deep_chain_40_full",
-                "tier": "functional",
-                "root_txid": deep_root,
-                "limits": limits_full,
-                "expect_truncated": False,
-                "required_nodes": [deep_root, chain_txids[-2], chain_txids[0]],
-                "required_edges": [
-                    {
-                        "spending_txid": chain_txids[-1],
-                        "input_index": 0,
-                        "funding_txid": chain_txids[-2],
-                        "funding_vout": chain_out[0]["vout"],
-                    }
-                ],
-            }
-        )
 
-        limits_depth = {"max_depth": 10, "max_nodes": 4096, "max_edges": 8192}
-        scenarios.append(
-            {
-                "name": "deep_chain_40_depth_limited",
-                "tier": "functional",
-                "root_txid": deep_root,
-                "limits": limits_depth,
-                "expect_truncated": True,
-                "required_nodes": [deep_root],
-                "required_edges": [],
-            }
-        )
+def build_wide_frontier_32(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    mine_wallet: str,
+    address_pool: AddressPool,
+    seeds: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    # Mine parents before root to avoid mempool ancestor limits.
+    parent_outs, parent_total = spend_each_seed(
+        handle, wallet=wallet, address_pool=address_pool, seeds=seeds
+    )
+    mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
 
+    wide_root, _wide_root_outs = spend_inputs(
+        handle,
+        wallet=wallet,
+        inputs=parent_outs,
+        output_values=[parent_total - 32_000],
+        dest_addrs=address_pool.take(1),
+    )
+    mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
+
+    return [
+        {
+            "name": "wide_frontier_32",
+            "tier": "functional",
+            "root_txid": wide_root,
+            "limits": dict(LIMITS_WIDE),
+            "expect_truncated": False,
+            "required_nodes": [wide_root],
+            "required_edges": fan_in_edges(wide_root, parent_outs, sampled=True),
+        },
         # node-limit truncation on wide root
-        limits_nodes = {"max_depth": 10, "max_nodes": 5, "max_edges": 8192}
-        scenarios.append(
-            {
-                "name": "node_limit_truncation",
-                "tier": "functional",
-                "root_txid": wide_root,
-                "limits": limits_nodes,
-                "expect_truncated": True,
-                "required_nodes": [wide_root],
-                "required_edges": [],
-            }
-        )
-
+        {
+            "name": "node_limit_truncation",
+            "tier": "functional",
+            "root_txid": wide_root,
+            "limits": dict(LIMITS_NODE_TRUNCATION),
+            "expect_truncated": True,
+            "required_nodes": [wide_root],
+            "required_edges": [],
+        },
         # edge-limit truncation on wide root
-        limits_edges = {"max_depth": 10, "max_nodes": 8192, "max_edges": 10}
-        scenarios.append(
-            {
-                "name": "edge_limit_truncation",
-                "tier": "functional",
-                "root_txid": wide_root,
-                "limits": limits_edges,
-                "expect_truncated": True,
-                "required_nodes": [wide_root],
-                "required_edges": [],
-                "expected_exact_node_count": 1,
-                "expected_exact_edge_count": 0,
-            }
+        {
+            "name": "edge_limit_truncation",
+            "tier": "functional",
+            "root_txid": wide_root,
+            "limits": dict(LIMITS_EDGE_TRUNCATION),
+            "expect_truncated": True,
+            "required_nodes": [wide_root],
+            "required_edges": [],
+            "expected_exact_node_count": 1,
+            "expected_exact_edge_count": 0,
+        },
+    ]
+
+
+def build_deep_chain_40(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    mine_wallet: str,
+    address_pool: AddressPool,
+    seed: dict[str, Any],
+) -> list[dict[str, Any]]:
+    chain_out = [seed]
+    chain_txids: list[str] = []
+    for i in range(40):
+        txid, chain_out = spend_inputs(
+            handle,
+            wallet=wallet,
+            inputs=chain_out,
+            output_values=[chain_out[0]["value_sat"] - 1_000],
+            dest_addrs=address_pool.take(1),
         )
+        chain_txids.append(txid)
+        if (i + 1) % MEMPOOL_ANCESTOR_CAP == 0:
+            mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
+    mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
+
+    deep_root = chain_txids[-1]
+    return [
+        {
+            "name": "deep_chain_40_full",
+            "tier": "functional",
+            "root_txid": deep_root,
+            "limits": dict(LIMITS_DEEP_FULL),
+            "expect_truncated": False,
+            "required_nodes": [deep_root, chain_txids[-2], chain_txids[0]],
+            "required_edges": [
+                required_edge(chain_txids[-1], 0, chain_txids[-2], chain_out[0]["vout"])
+            ],
+        },
+        {
+            "name": "deep_chain_40_depth_limited",
+            "tier": "functional",
+            "root_txid": deep_root,
+            "limits": dict(LIMITS_DEEP_DEPTH_LIMITED),
+            "expect_truncated": True,
+            "required_nodes": [deep_root],
+            "required_edges": [],
+        },
+    ]
+
+
+def build_spent_prevout_gap(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    mine_wallet: str,
+    address_pool: AddressPool,
+    seed: dict[str, Any],
+) -> list[dict[str, Any]]:
+    parent, parent_out = spend_inputs(
+        handle,
+        wallet=wallet,
+        inputs=[seed],
+        output_values=[seed["value_sat"] - 1_000],
+        dest_addrs=address_pool.take(1),
+    )
+    gap_root, _gap_out = spend_inputs(
+        handle,
+        wallet=wallet,
+        inputs=parent_out,
+        output_values=[parent_out[0]["value_sat"] - 1_000],
+        dest_addrs=address_pool.take(1),
+    )
+    mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
+
+    return [
+        {
+            "name": "spent_prevout_gap",
+            "tier": "functional",
+            "root_txid": gap_root,
+            "limits": dict(LIMITS_PREVOUT_GAP),
+            "expect_truncated": True,
+            "required_nodes": [gap_root],
+            "required_edges": [
+                required_edge(gap_root, 0, parent, parent_out[0]["vout"])
+            ],
+            "expected_unresolved_input_count": 0,
+        }
+    ]
 
-        # spent_prevout_gap
-        u3 = take_utxo()
-        parent, parent_out = spend_inputs(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
-            inputs=[u3],
-            output_values=[u3["value_sat"] - 1_000],
-        )
-        gap_root, _gap_out = spend_inputs(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
-            inputs=parent_out,
-            output_values=[parent_out[0]["value_sat"] - 1_000],
-        )
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-
-        limits_gap = {"max_depth": 0, "max_nodes": 64, "max_edges": 256}
-        scenarios.append(
-            {
-                "name": "spent_prevout_gap",
-                "tier": "functional",
-                "root_txid": gap_root,
-                "limits": limits_gap,
-                "expect_truncated": True,
-                "required_nodes": [gap_root],
-                "required_edges": [
-                    {
-                        "spending_txid": gap_root,
-                        "input_index": 0,
-                        "funding_txid": parent,
-                        "funding_vout": parent_out[0]["vout"],
-                    }
-                ],
-                "expected_unresolved_input_count": 0,
-            }
-        )
 
-    if tier in {"all", "stress"}:
-        # stress_deep_500
-        log(f"building stress_deep_{stress_target}")
-        u4 = take_utxo()
-        chain_out = [u4]
-        deep_txids: list[str] = []
-        for i in range(stress_target):
-            txid, chain_out = spend_inputs(
-                cli,
-                cli_json,
-                wallet=wallet_graph,
-                inputs=chain_out,
-                output_values=[chain_out[0]["value_sat"] - 1_000],
-            )
-            deep_txids.append(txid)
-            if (i + 1) % 20 == 0:
-                mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-                log(f"stress_deep progress: {i + 1}/{stress_target}")
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-        root_deep = deep_txids[-1]
-        limits = {
-            "max_depth": stress_target + 20,
-            "max_nodes": stress_target + 200,
-            "max_edges": (stress_target * 2) + 100,
-        }
-        scenarios.append(
-            {
-                "name": f"stress_deep_{stress_target}",
-                "tier": "stress",
-                "root_txid": root_deep,
-                "limits": limits,
-                "expect_truncated": False,
-                "required_nodes": [root_deep, deep_txids[-2], deep_txids[0]],
-                "required_edges": [
-                    {
-                        "spending_txid": deep_txids[-1],
-                        "input_index": 0,
-                        "funding_txid": deep_txids[-2],
-                        "funding_vout": chain_out[0]["vout"],
-                    }
-                ],
-            }
+def build_stress_deep(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    mine_wallet: str,
+    address_pool: AddressPool,
+    seed: dict[str, Any],
+    stress_target: int,
+) -> list[dict[str, Any]]:
+    log(f"building stress_deep_{stress_target}")
+    chain_out = [seed]
+    deep_txids: list[str] = []
+    for i in range(stress_target):
+        txid, chain_out = spend_inputs(
+            handle,
+            wallet=wallet,
+            inputs=chain_out,
+            output_values=[chain_out[0]["value_sat"] - 1_000],
+            dest_addrs=address_pool.take(1),
         )
+        deep_txids.append(txid)
+        if (i + 1) % MEMPOOL_ANCESTOR_CAP == 0:
+            mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
+            log(f"stress_deep progress: {i + 1}/{stress_target}")
+    mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
+    root_deep = deep_txids[-1]
+    limits = {
+        "max_depth": stress_target + 20,
+        "max_nodes": stress_target + 200,
+        "max_edges": (stress_target * 2) + 100,
+    }
+    return [
+        {
+            "name": f"stress_deep_{stress_target}",
+            "tier": "stress",
+            "root_txid": root_deep,
+            "limits": limits,
+            "expect_truncated": False,
+            "required_nodes": [root_deep, deep_txids[-2], deep_txids[0]],
+            "required_edges": [
+                required_edge(deep_txids[-1], 0, deep_txids[-2], chain_out[0]["vout"])
+            ],
+        }
+    ]
 
-        # stress_wide_500
-        log(f"building stress_wide_{stress_target}")
-        seed_inputs = [take_utxo() for _ in range(stress_target)]
-        parents: list[dict[str, Any]] = []
-        for idx, utxo in enumerate(seed_inputs):
-            _txid, outs = spend_inputs(
-                cli,
-                cli_json,
-                wallet=wallet_graph,
-                inputs=[utxo],
-                output_values=[utxo["value_sat"] - 1_000],
-            )
-            parents.extend(outs)
-            if (idx + 1) % 50 == 0:
-                log(f"stress_wide parent progress: {idx + 1}/{stress_target}")
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-
-        wide_root, _wide_out, wide_root_inputs = compress_to_single_outpoint(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
-            mine_wallet=wallet_miner,
-            outpoints=parents,
-        )
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
 
-        limits = {
-            "max_depth": 6,
-            "max_nodes": (stress_target * 3) + 200,
-            "max_edges": (stress_target * 4) + 200,
+def build_stress_wide(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    mine_wallet: str,
+    address_pool: AddressPool,
+    seeds: list[dict[str, Any]],
+    stress_target: int,
+) -> list[dict[str, Any]]:
+    log(f"building stress_wide_{stress_target}")
+    parents, parents_total = spend_each_seed(
+        handle,
+        wallet=wallet,
+        address_pool=address_pool,
+        seeds=seeds,
+        progress_label="stress_wide parent progress",
+    )
+    mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
+
+    wide_root, _wide_out, wide_root_inputs = compress_to_single_outpoint(
+        handle,
+        wallet=wallet,
+        mine_wallet=mine_wallet,
+        address_pool=address_pool,
+        outpoints=parents,
+        total_value_sat=parents_total,
+    )
+    mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
+
+    limits = {
+        "max_depth": 6,
+        "max_nodes": (stress_target * 3) + 200,
+        "max_edges": (stress_target * 4) + 200,
+    }
+    return [
+        {
+            "name": f"stress_wide_{stress_target}",
+            "tier": "stress",
+            "root_txid": wide_root,
+            "limits": limits,
+            "expect_truncated": False,
+            "required_nodes": [wide_root],
+            "required_edges": fan_in_edges(wide_root, wide_root_inputs, sampled=True),
         }
-        scenarios.append(
-            {
-                "name": f"stress_wide_{stress_target}",
-                "tier": "stress",
-                "root_txid": wide_root,
-                "limits": limits,
-                "expect_truncated": False,
-                "required_nodes": [wide_root],
-                "required_edges": [
-                    {
-                        "spending_txid": wide_root,
-                        "input_index": 0,
-                        "funding_txid": wide_root_inputs[0]["txid"],
-                        "funding_vout": wide_root_inputs[0]["vout"],
-                    },
-                    {
-                        "spending_txid": wide_root,
-                        "input_index": len(wide_root_inputs) - 1,
-                        "funding_txid": wide_root_inputs[-1]["txid"],
-                        "funding_vout": wide_root_inputs[-1]["vout"],
-                    },
-                ],
-            }
-        )
+    ]
 
-        # stress_merge_500
-        log(f"building stress_merge_{stress_target}")
-        u5 = take_utxo()
-        merge_chain_len = max(1, stress_target - 2)
-        merge_chain_out = [u5]
-        for i in range(merge_chain_len):
-            txid, merge_chain_out = spend_inputs(
-                cli,
-                cli_json,
-                wallet=wallet_graph,
-                inputs=merge_chain_out,
-                output_values=[merge_chain_out[0]["value_sat"] - PER_TX_FEE_SAT],
-            )
-            _ = txid
-            if (i + 1) % 20 == 0:
-                mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-                log(f"stress_merge chain progress: {i + 1}/{merge_chain_len}")
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-
-        merge_fanout = min(MAX_OUTPUTS_PER_TX, 100)
-        remaining = merge_chain_out[0]["value_sat"] - PER_TX_FEE_SAT
-        output_value = remaining // merge_fanout
-        if output_value <= 1_000:
-            raise RuntimeError("merge parent output value became too small")
-        merge_parent, merge_parent_outs = spend_inputs(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
+
+def build_stress_merge(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    mine_wallet: str,
+    address_pool: AddressPool,
+    seed: dict[str, Any],
+    stress_target: int,
+) -> list[dict[str, Any]]:
+    log(f"building stress_merge_{stress_target}")
+    merge_chain_len = max(1, stress_target - 2)
+    merge_chain_out = [seed]
+    for i in range(merge_chain_len):
+        txid, merge_chain_out = spend_inputs(
+            handle,
+            wallet=wallet,
             inputs=merge_chain_out,
-            output_values=[output_value for _ in range(merge_fanout)],
+            output_values=[merge_chain_out[0]["value_sat"] - PER_TX_FEE_SAT],
+            dest_addrs=address_pool.take(1),
         )
-        merge_root, _merge_outs = spend_inputs(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
-            inputs=merge_parent_outs,
-            output_values=[(output_value * merge_fanout) - 2_000],
-        )
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-
-        limits = {
-            # The merge scenario intentionally builds a long single-input chain
-            # before fanout; allow enough depth so this stress case validates a
-            # full (non-truncated) merge graph.
-            "max_depth": merge_chain_len + 10,
-            "max_nodes": 2048,
-            "max_edges": (stress_target * 3) + 100,
+        _ = txid
+        if (i + 1) % MEMPOOL_ANCESTOR_CAP == 0:
+            mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
+            log(f"stress_merge chain progress: {i + 1}/{merge_chain_len}")
+    mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
+
+    merge_fanout = min(MAX_OUTPUTS_PER_TX, 100)
+    remaining = merge_chain_out[0]["value_sat"] - PER_TX_FEE_SAT
+    output_value = remaining // merge_fanout
+    if output_value <= 1_000:
+        raise RuntimeError("merge parent output value became too small")
+    merge_parent, merge_parent_outs = spend_inputs(
+        handle,
+        wallet=wallet,
+        inputs=merge_chain_out,
+        output_values=[output_value] * merge_fanout,
+        dest_addrs=address_pool.take(merge_fanout),
+    )
+    merge_root, _merge_outs = spend_inputs(
+        handle,
+        wallet=wallet,
+        inputs=merge_parent_outs,
+        output_values=[(output_value * merge_fanout) - 2_000],
+        dest_addrs=address_pool.take(1),
+    )
+    mine_to_wallet(handle, wallet=mine_wallet, blocks=1)
+
+    limits = {
+        # The merge scenario intentionally builds a long single-input chain
+        # before fanout; allow enough depth so this stress case validates a
+        # full (non-truncated) merge graph.
+        "max_depth": merge_chain_len + 10,
+        "max_nodes": 2048,
+        "max_edges": (stress_target * 3) + 100,
+    }
+    return [
+        {
+            "name": f"stress_merge_{stress_target}",
+            "tier": "stress",
+            "root_txid": merge_root,
+            "limits": limits,
+            "expect_truncated": False,
+            "required_nodes": [merge_root, merge_parent],
+            "required_edges": fan_in_edges(merge_root, merge_parent_outs, sampled=True),
         }
-        scenarios.append(
-            {
-                "name": f"stress_merge_{stress_target}",
-                "tier": "stress",
-                "root_txid": merge_root,
-                "limits": limits,
-                "expect_truncated": False,
-                "required_nodes": [merge_root, merge_parent],
-                "required_edges": [
-                    {
-                        "spending_txid": merge_root,
-                        "input_index": 0,
-                        "funding_txid": merge_parent,
-                        "funding_vout": merge_parent_outs[0]["vout"],
-                    },
-                    {
-                        "spending_txid": merge_root,
-                        "input_index": merge_fanout - 1,
-                        "funding_txid": merge_parent,
-                        "funding_vout": merge_parent_outs[-1]["vout"],
-                    },
-                ],
-            }
+    ]
+
+
+def build_fixture_scenarios(
+    *,
+    handle: RegtestHandle,
+    wallet_graph: str,
+    wallet_miner: str,
+    mine_addr: str,
+    stress_target: int,
+    tier: str,
+) -> list[dict[str, Any]]:
+    utxos_needed = required_seed_utxos(tier, stress_target)
+    log(f"funding {utxos_needed} seed UTXOs for tier={tier}")
+    # Seeds are drawn from the front; a deque keeps each draw O(1) where
+    # `list.pop(0)` would shift the remaining few hundred entries.
+    utxos = deque(
+        fund_wallet_utxos(
+            handle,
+            source_wallet=wallet_miner,
+            dest_wallet=wallet_graph,
+            count=utxos_needed,
+            value_sat=100_000_000,
+            mine_addr=mine_addr,
+        )
+    )
+
+    def take_utxo() -> dict[str, Any]:
+        if not utxos:
+            raise RuntimeError("not enough funded UTXOs for scenario generation")
+        return utxos.popleft()
+
+    # Seeds are handed out on this thread before any builder starts, so the
+    # builders never share an outpoint and can run concurrently. Each one is
+    # an independent RPC-latency-bound chain of spends; mining is serialised
+    # inside `RegtestHandle.generate`, and an early block from another
+    # builder only confirms transactions sooner, which every scenario
+    # tolerates.
+    wallets = {
+        "wallet": wallet_graph,
+        "mine_wallet": wallet_miner,
+        # Shared by all builders; refilling it a hundred addresses at a time
+        # takes `getnewaddress` off the per-spend critical path.
+        "address_pool": AddressPool(handle, wallet=wallet_graph),
+    }
+    jobs: list[tuple[Callable[..., list[dict[str, Any]]], dict[str, Any]]] = []
+
+    if tier in {"all", "functional"}:
+        jobs.append((build_small_chain_3, {"seed": take_utxo()}))
+        jobs.append((build_merge_parent_double_input, {"seed": take_utxo()}))
+        jobs.append((build_wide_frontier_32, {"seeds": [take_utxo() for _ in range(32)]}))
+        jobs.append((build_deep_chain_40, {"seed": take_utxo()}))
+        jobs.append((build_spent_prevout_gap, {"seed": take_utxo()}))
+
+    if tier in {"all", "stress"}:
+        stress = {"stress_target": stress_target}
+        jobs.append((build_stress_deep, {"seed": take_utxo(), **stress}))
+        jobs.append(
+            (build_stress_wide, {"seeds": [take_utxo() for _ in range(stress_target)], **stress})
         )
+        jobs.append((build_stress_merge, {"seed": take_utxo(), **stress}))
 
-    return scenarios
+    with ThreadPoolExecutor(
+        max_workers=SCENARIO_WORKERS, thread_name_prefix="graph-scenario"
+    ) as pool:
+        futures = [pool.submit(builder, handle, **wallets, **kwargs) for builder, kwargs in jobs]
+        # Collected in submission order so the fixture layout does not depend
+        # on thread scheduling.
+        return [scenario for future in futures for scenario in future.result()]
 
 
 def main() -> int:
@@ -575,14 +657,12 @@ def main() -> int:
     handle = start_bitcoind(cfg)
     try:
         log("creating graph test wallets")
-        handle.cli(["createwallet", wallet_miner])
-        handle.cli(["createwallet", wallet_graph])
+        create_wallets(handle, wallet_miner, wallet_graph)
 
-        mine_addr = mine_to_wallet(handle.cli, wallet=wallet_miner, blocks=130)
+        mine_addr = mine_to_wallet(handle, wallet=wallet_miner, blocks=130)
 
         scenarios = build_fixture_scenarios(
-            cli=handle.cli,
-            cli_json=handle.cli_json,
+            handle=handle,
             wallet_graph=wallet_graph,
             wallet_miner=wallet_miner,
             mine_addr=mine_addr,
@@ -596,7 +676,7 @@ def main() -> int:
             "stress_target": stress_target,
             "scenarios": scenarios,
         }
-        fixture_file.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        write_json_file(fixture_file, payload)
         log(f"wrote graph fixture to {fixture_file}")
 
         run_ignored_rust_test(
@@ -6,12 +6,20 @@ import sys
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from common import (
+    create_wallets,
     log,
     make_config,
+    mine_to_wallet,
+    new_addresses,
     run_ignored_rust_test,
     start_bitcoind,
 )
 
+# bitcoind rejects a transaction once it has more than 25 unconfirmed
+# ancestors (itself included); the wallet may chain every send on the previous
+# send's change, so mine well before that.
+SENDS_PER_BLOCK = 20
+
 
 def main() -> int:
     root_dir = Path(__file__).resolve().parent.parent.parent
@@ -32,41 +40,60 @@ def main() -> int:
     handle = start_bitcoind(cfg)
     try:
         log("creating wallets")
-        handle.cli(["createwallet", wallet])
-        handle.cli(["createwallet", sink_wallet])
+        create_wallets(handle, wallet, sink_wallet)
 
-        mine_addr = handle.cli(["getnewaddress", "", "bech32"], rpc_wallet=wallet)
         log("mining initial 110 blocks")
-        handle.cli(["generatetoaddress", "110", mine_addr])
+        mine_addr = mine_to_wallet(handle, wallet=wallet, blocks=110)
 
-        txids_file.write_text("", encoding="utf-8")
-        outpoints_file.write_text("", encoding="utf-8")
+        txid_lines: list[str] = []
+        outpoint_lines: list[str] = []
 
         log(f"creating {tx_count} transactions")
-        for idx in range(tx_count):
-            recv_addr = handle.cli(["getnewaddress", "", "bech32"], rpc_wallet=sink_wallet)
-            txid = handle.cli(["sendtoaddress", recv_addr, "1.0"], rpc_wallet=wallet)
-            with txids_file.open("a", encoding="utf-8") as f:
-                f.write(f"{txid}\n")
-
-            tx = handle.cli_json(["getrawtransaction", txid, "1"])
-            vout_match = None
-            for output in tx.get("vout", []):
-                spk = output.get("scriptPubKey", {})
-                if spk.get("address") == recv_addr:
-                    vout_match = output.get("n")
-                    break
-            if vout_match is None:
-                raise RuntimeError(
-                    f"no matching recipient output found in tx {txid} for address {recv_addr}"
-                )
-
-            outpoint = f"{txid}:{vout_match}"
-            with outpoints_file.open("a", encoding="utf-8") as f:
-                f.write(f"{outpoint}\n")
-
-            handle.cli(["generatetoaddress", "1", mine_addr])
-            log(f"tx {idx + 1}/{tx_count}: {txid} outpoint={outpoint}")
+        created = 0
+        for start in range(0, tx_count, SENDS_PER_BLOCK):
+            count = min(SENDS_PER_BLOCK, tx_count - start)
+            # Each round is three batched round-trips instead of four calls per
+            # transaction. Sends stay in bitcoind's batch order, so later sends
+            # may spend earlier change; mining after every SENDS_PER_BLOCK
+            # sends keeps that chain under the mempool limits.
+            recv_addrs = new_addresses(handle, wallet=sink_wallet, count=count)
+            txids = handle.rpc_batch(
+                [("sendtoaddress", [addr, "1.0"]) for addr in recv_addrs],
+                rpc_wallet=wallet,
+            )
+            # The sending wallet already records which vout paid each address,
+            # so `gettransaction` answers from wallet state without decoding
+            # the transaction. The block rides along at the end of the batch.
+            *wallet_txs, _block_hashes = handle.rpc_batch(
+                [("gettransaction", [txid]) for txid in txids]
+                + [("generatetoaddress", [1, mine_addr])],
+                rpc_wallet=wallet,
+            )
+
+            for recv_addr, txid, wallet_tx in zip(recv_addrs, txids, wallet_txs):
+                txid_lines.append(f"{txid}\n")
+
+                vout_by_address = {
+                    detail.get("address"): detail.get("vout")
+                    for detail in wallet_tx.get("details", [])
+                    if detail.get("category") == "send"
+                }
+                vout_match = vout_by_address.get(recv_addr)
+                if vout_match is None:
+                    raise RuntimeError(
+                        f"no matching recipient output found in tx {txid} for address {recv_addr}"
+                    )
+
+                outpoint = f"{txid}:{vout_match}"
+                outpoint_lines.append(f"{outpoint}\n")
+
+                created += 1
+                log(f"tx {created}/{tx_count}: {txid} outpoint={outpoint}")
+
+        # Written once after all transactions exist; the Rust test only reads
+        # the files after this point, so incremental appends bought nothing.
+        txids_file.write_text("".join(txid_lines), encoding="utf-8")
+        outpoints_file.write_text("".join(outpoint_lines), encoding="utf-8")
 
         run_ignored_rust_test(
             cfg,
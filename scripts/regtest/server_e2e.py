@@ -1,22 +1,26 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import json
+from concurrent.futures import Future, ThreadPoolExecutor
 import os
 from pathlib import Path
 import sys
+from typing import Any
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from common import (
+    create_wallets,
     log,
     make_config,
+    mine_to_wallet,
     pick_free_port,
     run_ignored_rust_test_in_package,
     start_cory,
     start_bitcoind,
     stop_process,
     wait_for_health,
+    write_json_file,
 )
 
 
@@ -41,22 +45,16 @@ def main() -> int:
     handle = start_bitcoind(cfg)
     cory_proc = None
     cory_log_file = None
+    startup_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cory-startup")
+    cory_startup: Future[tuple[Any, Any, str, str]] | None = None
     try:
-        log("creating server test wallets")
-        handle.cli(["createwallet", wallet_miner])
-        handle.cli(["createwallet", wallet_sink])
-
-        mine_addr = handle.cli(["getnewaddress", "", "bech32"], rpc_wallet=wallet_miner)
-        log("mining initial 110 blocks")
-        handle.cli(["generatetoaddress", "110", mine_addr])
-
-        recv_addr = handle.cli(["getnewaddress", "", "bech32"], rpc_wallet=wallet_sink)
-        txid = handle.cli(["sendtoaddress", recv_addr, "1.0"], rpc_wallet=wallet_miner)
-        handle.cli(["generatetoaddress", "1", mine_addr])
-        log(f"created fixture transaction txid={txid}")
-
+        # cory only needs bitcoind's RPC endpoint, which is up once
+        # `start_bitcoind` returns. Its startup (a `cargo run` that may have
+        # to build) is the longest fixed cost here, so it overlaps the wallet
+        # setup and mining below instead of following them.
         rpc_url = f"http://127.0.0.1:{cfg.rpc_port}"
-        cory_proc, cory_log_file, base_url, api_token = start_cory(
+        cory_startup = startup_pool.submit(
+            start_cory,
             root_dir=root_dir,
             connection=rpc_url,
             rpc_user=cfg.rpc_user,
@@ -65,6 +63,19 @@ def main() -> int:
             port=port,
             log_path=cory_log,
         )
+
+        log("creating server test wallets")
+        create_wallets(handle, wallet_miner, wallet_sink)
+
+        log("mining initial 110 blocks")
+        mine_addr = mine_to_wallet(handle, wallet=wallet_miner, blocks=110)
+
+        recv_addr = handle.rpc("getnewaddress", ["", "bech32"], rpc_wallet=wallet_sink)
+        txid = handle.rpc("sendtoaddress", [recv_addr, "1.0"], rpc_wallet=wallet_miner)
+        handle.generate(1, mine_addr)
+        log(f"created fixture transaction txid={txid}")
+
+        cory_proc, cory_log_file, base_url, api_token = cory_startup.result()
         wait_for_health(base_url)
         log(f"cory server ready at {base_url}")
 
@@ -73,7 +84,7 @@ def main() -> int:
             "base_url": base_url,
             "valid_txid": txid,
         }
-        fixture_file.write_text(json.dumps(fixture, indent=2), encoding="utf-8")
+        write_json_file(fixture_file, fixture)
         log(f"wrote server fixture to {fixture_file}")
 
         run_ignored_rust_test_in_package(
@@ -90,6 +101,14 @@ def main() -> int:
         log("server endpoint integration check passed")
         return 0
     finally:
+        if cory_proc is None and cory_startup is not None:
+            # Setup failed while cory was still starting; wait for it so the
+            # process is not leaked. A failed startup has nothing to clean up.
+            try:
+                cory_proc, cory_log_file, _base_url, _api_token = cory_startup.result()
+            except Exception:
+                pass
+        startup_pool.shutdown()
         if cory_proc is not None:
             stop_process(cory_proc, name="cory")
         if cory_log_file is not None:
@@ -2,30 +2,41 @@
 from __future__ import annotations
 
 import argparse
-import json
+from concurrent.futures import ThreadPoolExecutor
+import itertools
 import os
 from pathlib import Path
 import signal
-import subprocess
 import sys
-import time
-from typing import Any, TypedDict
+from typing import Any, Callable, Iterator, TypedDict
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+ROOT_DIR = SCRIPTS_DIR.parent
+
+sys.path.insert(0, str(SCRIPTS_DIR))
 
 from common import (
+    AddressPool,
     PER_TX_FEE_SAT,
+    RegtestHandle,
+    RpcError,
+    build_cory,
+    create_wallets,
     fund_wallet_utxos,
     log,
     make_config,
     mine_to_wallet,
     pick_free_port,
     sat_to_btc,
+    spend_chain,
     spend_inputs,
+    spend_inputs_batch,
+    spend_one_to_one,
     start_bitcoind,
     start_cory,
     stop_process,
     wait_for_health,
+    write_json_file,
 )
 
 LABEL_TARGET_TYPES = ("tx", "addr", "input", "output")
@@ -39,6 +50,24 @@ RO_LABEL_FILES = (
     Path("incidents/hacks_2024.jsonl"),
     Path("incidents/sanctions.jsonl"),
 )
+# Every generated label record has this fixed shape, and all three values
+# are ASCII without quotes or backslashes (label types, hex txids,
+# `txid:index` refs, bech32 addresses and path-derived label names), so
+# they need no JSON escaping. `.encode("ascii")` fails loudly if that ever
+# stops holding.
+LABEL_RECORD_TEMPLATE = b'{"type":"%s","ref":"%s","label":"%s"}\n'
+# One worker per concurrently built scenario; each is a short chain of
+# RPC-latency-bound spends, so the threads mostly wait on bitcoind.
+SCENARIO_WORKERS = 8
+# Column layout of the printed scenario catalog, keyed by scenario record
+# fields so the header and every row share one spec.
+SCENARIO_ROW_FMT = "{name:<36} {root_txid:<64} {why_interesting:<32} {ui_focus}"
+SCENARIO_TABLE_HEADER = SCENARIO_ROW_FMT.format(
+    name="name",
+    root_txid="root txid",
+    why_interesting="why interesting",
+    ui_focus="what to look for in UI",
+)
 
 
 class LabelRefs(TypedDict):
@@ -57,11 +86,157 @@ class LabelPackInfo(TypedDict):
     ro_dir_display: str
 
 
+class ScenarioNotes(TypedDict):
+    description: str
+    suggested_ui_checks: list[str]
+    why_interesting: str
+    ui_focus: str
+
+
+# Catalog text for each scenario kind, kept apart from the builders so they
+# only deal with transactions. `{count}` in a description is filled with the
+# profile-dependent input/output count.
+SCENARIO_NOTES: dict[str, ScenarioNotes] = {
+    "simple_chain": {
+        "description": "Linear ancestry chain with four hops.",
+        "suggested_ui_checks": [
+            "Graph renders a single path with one parent per node.",
+            "No truncation expected with default limits.",
+        ],
+        "why_interesting": "Baseline shape for sanity checks.",
+        "ui_focus": "Verify depth progression and edge direction.",
+    },
+    "diamond_merge": {
+        "description": "Split into two branches that merge back into one root.",
+        "suggested_ui_checks": [
+            "Merged parent appears once as a deduped DAG node.",
+            "Root has two input edges from different branch txs.",
+        ],
+        "why_interesting": "Validates merge handling and de-duplication.",
+        "ui_focus": "Look for shared ancestor behavior.",
+    },
+    "fan_in": {
+        "description": "Consolidation transaction spending {count} inputs.",
+        "suggested_ui_checks": [
+            "Root has many incoming ancestry edges.",
+            "Check performance on wide incoming edge sets.",
+        ],
+        "why_interesting": "Exercises dense input fan-in rendering.",
+        "ui_focus": "Inspect edge count and node detail stability.",
+    },
+    "fan_out": {
+        "description": "Single-input payout creating {count} outputs.",
+        "suggested_ui_checks": [
+            "Root has one parent in ancestry despite many outputs.",
+            "Node detail should show large output list cleanly.",
+        ],
+        "why_interesting": "Shows output-heavy tx detail handling.",
+        "ui_focus": "Inspect output rendering and labeling controls.",
+    },
+    "coinjoin_like": {
+        "description": "Multi-input transaction with equal-valued outputs.",
+        "suggested_ui_checks": [
+            "Equal output amounts are visible in tx detail.",
+            "No heuristic claims should imply deterministic linkage.",
+        ],
+        "why_interesting": "Resembles common collaborative spend patterns.",
+        "ui_focus": "Verify value symmetry and neutral interpretation.",
+    },
+    "cpfp_parent_child": {
+        "description": "Unconfirmed parent with child paying a higher fee.",
+        "suggested_ui_checks": [
+            "Root ancestry includes the unconfirmed parent.",
+            "Fee and feerate differ notably between parent and child.",
+        ],
+        "why_interesting": "Shows package-like ancestor relationships.",
+        "ui_focus": "Compare fee metrics parent vs child.",
+    },
+    "op_return_payload": {
+        "description": "Transaction includes an OP_RETURN data output.",
+        "suggested_ui_checks": [
+            "Output script classification includes OP_RETURN.",
+            "Data-carrying output does not break graph or label UI.",
+        ],
+        "why_interesting": "Covers non-spendable output script types.",
+        "ui_focus": "Confirm script type enrichment and output listing.",
+    },
+    "deep_chain": {
+        "description": "Long ancestry chain meant to exceed default max_depth=50.",
+        "suggested_ui_checks": [
+            "Default graph request reports truncated=true.",
+            "Increasing max_depth query parameter reveals deeper ancestry.",
+        ],
+        "why_interesting": "Demonstrates limit-driven truncation behavior.",
+        "ui_focus": "Check truncated flag and depth stats in API response.",
+    },
+    "rbf_replacement": {
+        "description": "RBF-signaling transaction replaced by a higher-fee spend.",
+        "suggested_ui_checks": [
+            "Replacement tx appears as current spend of the same outpoint.",
+            "RBF signaling metadata is visible on the replacement path.",
+        ],
+        "why_interesting": "Validates replaceability and mempool replacement behavior.",
+        "ui_focus": "Inspect sequence-based signaling and tx history context.",
+    },
+    "rbf_original_only": {
+        "description": "RBF-signaling transaction (replacement was rejected by mempool policy).",
+        "suggested_ui_checks": [
+            "RBF signaling metadata is visible on the original tx.",
+        ],
+        "why_interesting": "Shows RBF signaling even when replacement is unavailable.",
+        "ui_focus": "Inspect sequence-based signaling.",
+    },
+    "chaos_sweep_matrix": {
+        "description": (
+            "21-layer cross-woven sweep lattice with 435 transactions and "
+            "high edge density under default graph limits."
+        ),
+        "suggested_ui_checks": [
+            "Graph remains navigable despite very dense merge/sweep ancestry.",
+            "Cross-layer joins create non-local edges that still preserve traceability.",
+            "High-input transactions keep node details and label editor responsive.",
+        ],
+        "why_interesting": "Maximum-complexity manual fixture for UI ancestry readability.",
+        "ui_focus": "Traceability under extreme edge density and repeated sweep patterns.",
+    },
+}
+
+
+def scenario_record(
+    kind: str,
+    *,
+    name: str,
+    root_txid: str,
+    related_txids: list[str],
+    label_txids: list[str] | None = None,
+    count: int | None = None,
+) -> dict[str, Any]:
+    notes = SCENARIO_NOTES[kind]
+    record: dict[str, Any] = {
+        "name": name,
+        "description": notes["description"].format(count=count),
+        "root_txid": root_txid,
+        "related_txids": related_txids,
+    }
+    if label_txids is not None:
+        record["label_txids"] = label_txids
+    record["suggested_ui_checks"] = list(notes["suggested_ui_checks"])
+    record["why_interesting"] = notes["why_interesting"]
+    record["ui_focus"] = notes["ui_focus"]
+    return record
+
+
 def repo_relative_or_abs(path: Path, root_dir: Path) -> str:
-    try:
-        return str(path.relative_to(root_dir))
-    except ValueError:
-        return str(path)
+    # Lexical prefix check on the normalised strings, equivalent to
+    # `path.relative_to(root_dir)` but without raising for outside paths.
+    path_str = str(path)
+    root_str = str(root_dir)
+    if path_str == root_str:
+        return "."
+    prefix = root_str.rstrip(os.sep) + os.sep
+    if path_str.startswith(prefix):
+        return path_str[len(prefix):]
+    return path_str
 
 
 def dedupe_preserve_order(items: list[str]) -> list[str]:
@@ -75,7 +250,7 @@ def dedupe_preserve_order(items: list[str]) -> list[str]:
     return out
 
 
-def collect_label_refs(cli_json, scenarios: list[dict[str, Any]]) -> LabelRefs:
+def collect_label_refs(handle: RegtestHandle, scenarios: list[dict[str, Any]]) -> LabelRefs:
     # Allow scenarios to narrow the txids used for label fixture generation.
     # This avoids probing intentionally stale/conflicted txids (for example an
     # RBF-replaced original tx) that are useful for scenario metadata but
@@ -91,41 +266,45 @@ def collect_label_refs(cli_json, scenarios: list[dict[str, Any]]) -> LabelRefs:
             )
         ]
     )
+    # `candidate_txids` is already unique, so txids and their `txid:index`
+    # refs are unique by construction; only addresses repeat across
+    # transactions and need a seen-set.
     available_txids: list[str] = []
     input_refs: list[str] = []
     output_refs: list[str] = []
     addresses: list[str] = []
+    seen_addresses: set[str] = set()
 
     # Build references from live tx data so generated labels always map to
     # entities that exist in the current fixture graph.
-    for txid in candidate_txids:
-        try:
-            tx = cli_json(["getrawtransaction", txid, "1"])
-        except subprocess.CalledProcessError as exc:
-            log(f"WARNING: skipping unavailable txid while generating labels: {txid} ({exc})")
+    # Most scenario transactions were decoded when they were broadcast, and
+    # their seeds when they were funded, so those are served from the
+    # handle's tx cache. The simple and deep chain hops are not:
+    # `spend_one_to_one` and `spend_chain` never decode what they send, so
+    # those hops are cache misses, fetched together with any others in one
+    # batch.
+    for txid, tx in zip(candidate_txids, handle.get_raw_txs(candidate_txids)):
+        if isinstance(tx, RpcError):
+            log(f"WARNING: skipping unavailable txid while generating labels: {txid} ({tx})")
             continue
-        if not isinstance(tx, dict):
-            raise RuntimeError(f"unexpected getrawtransaction response for {txid}: {tx!r}")
         available_txids.append(txid)
 
-        vins = tx.get("vin", [])
-        for vin_idx, _ in enumerate(vins):
-            input_refs.append(f"{txid}:{vin_idx}")
+        input_refs.extend(f"{txid}:{vin_idx}" for vin_idx in range(len(tx.get("vin", []))))
 
-        vouts = tx.get("vout", [])
-        for vout in vouts:
+        for vout in tx.get("vout", []):
             vout_n = int(vout["n"])
             output_refs.append(f"{txid}:{vout_n}")
             script = vout.get("scriptPubKey", {})
             addr = script.get("address")
-            if isinstance(addr, str) and addr:
+            if isinstance(addr, str) and addr and addr not in seen_addresses:
+                seen_addresses.add(addr)
                 addresses.append(addr)
 
     refs: LabelRefs = {
-        "tx": dedupe_preserve_order(available_txids),
-        "input": dedupe_preserve_order(input_refs),
-        "output": dedupe_preserve_order(output_refs),
-        "addr": dedupe_preserve_order(addresses),
+        "tx": available_txids,
+        "input": input_refs,
+        "output": output_refs,
+        "addr": addresses,
     }
     for label_type, values in refs.items():
         if not values:
@@ -133,37 +312,41 @@ def collect_label_refs(cli_json, scenarios: list[dict[str, Any]]) -> LabelRefs:
     return refs
 
 
-def pick_ref(pool: list[str], cursor: int) -> tuple[str, int]:
-    if not pool:
-        raise RuntimeError("cannot pick from an empty reference pool")
-    idx = cursor % len(pool)
-    return pool[idx], cursor + 1
-
-
 def write_jsonl(path: Path, records: list[dict[str, str]]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    lines = [json.dumps(record, separators=(",", ":")) for record in records]
-    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    # Callers create `path.parent`. A label file is a handful of records,
+    # so it is rendered in memory and handed to the kernel with a raw
+    # `os.write`, skipping the io-module buffer setup per file.
+    payload = b"".join(
+        LABEL_RECORD_TEMPLATE
+        % (
+            record["type"].encode("ascii"),
+            record["ref"].encode("ascii"),
+            record["label"].encode("ascii"),
+        )
+        for record in records
+    )
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
 
 
 def build_label_records(
     *,
     file_prefix: str,
-    refs: LabelRefs,
-    cursors: dict[str, int],
+    ref_cycles: dict[str, Iterator[str]],
 ) -> list[dict[str, str]]:
-    records: list[dict[str, str]] = []
-    for label_type in LABEL_TARGET_TYPES:
-        ref, next_cursor = pick_ref(refs[label_type], cursors[label_type])
-        cursors[label_type] = next_cursor
-        records.append(
-            {
-                "type": label_type,
-                "ref": ref,
-                "label": f"{file_prefix}_{label_type}",
-            }
-        )
-    return records
+    return [
+        {
+            "type": label_type,
+            "ref": next(ref_cycles[label_type]),
+            "label": f"{file_prefix}_{label_type}",
+        }
+        for label_type in LABEL_TARGET_TYPES
+    ]
 
 
 def generate_persistent_label_dirs(
@@ -171,33 +354,48 @@ def generate_persistent_label_dirs(
     root_dir: Path,
     tmp_dir: Path,
     run_id: str,
-    cli_json,
+    handle: RegtestHandle,
     scenarios: list[dict[str, Any]],
 ) -> LabelPackInfo:
-    refs = collect_label_refs(cli_json, scenarios)
+    refs = collect_label_refs(handle, scenarios)
     labels_root = Path(tmp_dir) / f"ui_manual_labels-{run_id}"
     rw_dir = labels_root / "rw"
     ro_dir = labels_root / "ro"
 
     # Folder layout intentionally mixes one-file and multi-file folders so
     # manual testing can verify recursive discovery and grouping.
-    cursors = {label_type: 0 for label_type in LABEL_TARGET_TYPES}
-
-    for rel in RW_LABEL_FILES:
-        stem = rel.with_suffix("").as_posix().replace("/", "_")
-        write_jsonl(
-            rw_dir / rel,
-            build_label_records(file_prefix=f"rw_{stem}", refs=refs, cursors=cursors),
-        )
-    for rel in RO_LABEL_FILES:
-        stem = rel.with_suffix("").as_posix().replace("/", "_")
-        write_jsonl(
-            ro_dir / rel,
-            build_label_records(file_prefix=f"ro_{stem}", refs=refs, cursors=cursors),
-        )
+    # Each label type walks its ref pool round-robin across all files.
+    # `collect_label_refs` guarantees every pool is non-empty.
+    ref_cycles = {
+        label_type: itertools.cycle(refs[label_type]) for label_type in LABEL_TARGET_TYPES
+    }
+    # Several label files share a folder; create each one only once.
+    created_dirs: set[Path] = set()
+
+    def emit(files: tuple[Path, ...], out_dir: Path, prefix: str) -> list[str]:
+        # The file id and the label prefix come from the same stem, so the
+        # path is walked once per file.
+        ids: list[str] = []
+        for rel in files:
+            file_id = rel.with_suffix("").as_posix()
+            ids.append(file_id)
+            path = out_dir / rel
+            if path.parent not in created_dirs:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(path.parent)
+            write_jsonl(
+                path,
+                build_label_records(
+                    file_prefix=f"{prefix}_{file_id.replace('/', '_')}",
+                    ref_cycles=ref_cycles,
+                ),
+            )
+        return ids
 
-    rw_ids = [rel.with_suffix("").as_posix() for rel in RW_LABEL_FILES]
-    ro_ids = [rel.with_suffix("").as_posix() for rel in RO_LABEL_FILES]
+    # RW files are written first so they keep the first picks of every ref
+    # pool.
+    rw_ids = emit(RW_LABEL_FILES, rw_dir, "rw")
+    ro_ids = emit(RO_LABEL_FILES, ro_dir, "ro")
     return {
         "rw_dir": rw_dir,
         "ro_dir": ro_dir,
@@ -208,371 +406,436 @@ def generate_persistent_label_dirs(
     }
 
 
-def send_raw_with_outputs(
-    cli,
-    cli_json,
-    *,
-    wallet: str,
+def raw_tx_params(
     inputs: list[dict[str, Any]],
-    outputs: dict[str, float],
+    outputs: dict[str, str],
+    *,
     op_return_data_hex: str | None = None,
     sequence: int | None = None,
-) -> str:
-    raw_inputs = []
-    for inp in inputs:
-        raw_in = {"txid": inp["txid"], "vout": inp["vout"]}
-        if sequence is not None:
-            raw_in["sequence"] = sequence
-        raw_inputs.append(raw_in)
+) -> list[Any]:
+    if sequence is None:
+        raw_inputs = [{"txid": inp["txid"], "vout": inp["vout"]} for inp in inputs]
+    else:
+        raw_inputs = [
+            {"txid": inp["txid"], "vout": inp["vout"], "sequence": sequence} for inp in inputs
+        ]
 
     raw_outputs: dict[str, Any] = dict(outputs)
     if op_return_data_hex is not None:
         raw_outputs["data"] = op_return_data_hex
+    return [raw_inputs, raw_outputs]
 
-    raw_hex = cli(
-        ["createrawtransaction", json.dumps(raw_inputs), json.dumps(raw_outputs)],
+
+def sign_raw_transactions(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    drafts: list[list[Any]],
+) -> list[str]:
+    # Creating and signing do not touch the mempool, so every draft shares
+    # one batch per stage; only the broadcasts need to stay ordered.
+    raw_hexes = handle.rpc_batch(
+        [("createrawtransaction", params) for params in drafts], rpc_wallet=wallet
+    )
+    signed = handle.rpc_batch(
+        [("signrawtransactionwithwallet", [raw_hex]) for raw_hex in raw_hexes],
         rpc_wallet=wallet,
     )
-    signed = cli_json(["signrawtransactionwithwallet", raw_hex], rpc_wallet=wallet)
-    if not signed.get("complete"):
+    if not all(entry.get("complete") for entry in signed):
         raise RuntimeError("signrawtransactionwithwallet returned incomplete=false")
-    return cli(["sendrawtransaction", signed["hex"]], rpc_wallet=wallet)
-
+    return [entry["hex"] for entry in signed]
 
-def build_scenarios(
-    *,
-    cli,
-    cli_json,
-    wallet_graph: str,
-    wallet_miner: str,
-    mine_addr: str,
-    profile: str,
-) -> list[dict[str, Any]]:
-    profile_cfg = {
-        "fast": {"fan": 20, "equal": 5, "long_depth": 52, "seed_count": 120},
-        "balanced": {"fan": 24, "equal": 6, "long_depth": 60, "seed_count": 120},
-        "rich": {"fan": 40, "equal": 10, "long_depth": 80, "seed_count": 1_000},
-    }
-    cfg = profile_cfg[profile]
-    fan_count = cfg["fan"]
-    equal_count = cfg["equal"]
-    long_depth = cfg["long_depth"]
-    seed_count = cfg["seed_count"]
 
-    # We pre-fund many small UTXOs to keep scenario construction deterministic and
-    # independent from wallet coin selection.
-    utxos = fund_wallet_utxos(
-        cli,
-        cli_json,
-        source_wallet=wallet_miner,
-        dest_wallet=wallet_graph,
-        mine_addr=mine_addr,
-        count=seed_count,
-        value_sat=100_000_000,
+def broadcast_signed(handle: RegtestHandle, *, wallet: str, signed_hex: str) -> str:
+    # As in `spend_inputs_batch`, the decode rides along with the broadcast
+    # and seeds the handle's tx cache, so `collect_label_refs` later reads
+    # these transactions without another lookup.
+    txid, tx = handle.rpc_batch(
+        [
+            ("sendrawtransaction", [signed_hex]),
+            ("decoderawtransaction", [signed_hex]),
+        ],
+        rpc_wallet=wallet,
     )
+    handle.remember_txs([tx])
+    return txid
 
-    def take_utxo() -> dict[str, Any]:
-        if not utxos:
-            raise RuntimeError("not enough funded UTXOs for scenario generation")
-        return utxos.pop(0)
 
-    scenarios: list[dict[str, Any]] = []
+def send_raw_with_outputs(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    inputs: list[dict[str, Any]],
+    outputs: dict[str, str],
+    op_return_data_hex: str | None = None,
+    sequence: int | None = None,
+) -> str:
+    [signed_hex] = sign_raw_transactions(
+        handle,
+        wallet=wallet,
+        drafts=[
+            raw_tx_params(
+                inputs, outputs, op_return_data_hex=op_return_data_hex, sequence=sequence
+            )
+        ],
+    )
+    return broadcast_signed(handle, wallet=wallet, signed_hex=signed_hex)
+
 
-    # 1) Simple payment chain (3-5 hops).
-    simple = [take_utxo()]
+def build_simple_chain_4(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    address_pool: AddressPool,
+    seed: dict[str, Any],
+) -> dict[str, Any]:
+    simple = seed
     simple_txids: list[str] = []
-    for _ in range(4):
-        txid, simple = spend_inputs(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
-            inputs=simple,
-            output_values=[simple[0]["value_sat"] - PER_TX_FEE_SAT],
-        )
+    for dest_addr in address_pool.take(4):
+        txid, simple = spend_one_to_one(handle, wallet=wallet, utxo=simple, dest_addr=dest_addr)
         simple_txids.append(txid)
-    mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-    scenarios.append(
-        {
-            "name": "simple_chain_4",
-            "description": "Linear ancestry chain with four hops.",
-            "root_txid": simple_txids[-1],
-            "related_txids": simple_txids,
-            "suggested_ui_checks": [
-                "Graph renders a single path with one parent per node.",
-                "No truncation expected with default limits.",
-            ],
-            "why_interesting": "Baseline shape for sanity checks.",
-            "ui_focus": "Verify depth progression and edge direction.",
-        }
+    return scenario_record(
+        "simple_chain",
+        name="simple_chain_4",
+        root_txid=simple_txids[-1],
+        related_txids=simple_txids,
     )
 
-    # 2) Diamond/merge DAG.
+
+def build_diamond_merge(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    address_pool: AddressPool,
+    seed: dict[str, Any],
+) -> dict[str, Any]:
     parent_txid, parent_outs = spend_inputs(
-        cli,
-        cli_json,
-        wallet=wallet_graph,
-        inputs=[take_utxo()],
+        handle,
+        wallet=wallet,
+        inputs=[seed],
         output_values=[49_999_000, 49_999_000],
+        dest_addrs=address_pool.take(2),
     )
-    left_txid, left_out = spend_inputs(
-        cli,
-        cli_json,
-        wallet=wallet_graph,
-        inputs=[parent_outs[0]],
-        output_values=[49_998_000],
-    )
-    right_txid, right_out = spend_inputs(
-        cli,
-        cli_json,
-        wallet=wallet_graph,
-        inputs=[parent_outs[1]],
-        output_values=[49_998_000],
+    # The two branches spend different parent outputs, so they are built,
+    # signed and broadcast together.
+    (left_txid, left_out), (right_txid, right_out) = spend_inputs_batch(
+        handle,
+        wallet=wallet,
+        spends=[([parent_outs[0]], [49_998_000]), ([parent_outs[1]], [49_998_000])],
+        dest_addrs=address_pool.take(2),
     )
     merge_txid, _ = spend_inputs(
-        cli,
-        cli_json,
-        wallet=wallet_graph,
+        handle,
+        wallet=wallet,
         inputs=left_out + right_out,
         output_values=[99_994_000],
+        dest_addrs=address_pool.take(1),
     )
-    mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-    scenarios.append(
-        {
-            "name": "diamond_merge",
-            "description": "Split into two branches that merge back into one root.",
-            "root_txid": merge_txid,
-            "related_txids": [merge_txid, left_txid, right_txid, parent_txid],
-            "suggested_ui_checks": [
-                "Merged parent appears once as a deduped DAG node.",
-                "Root has two input edges from different branch txs.",
-            ],
-            "why_interesting": "Validates merge handling and de-duplication.",
-            "ui_focus": "Look for shared ancestor behavior.",
-        }
+    return scenario_record(
+        "diamond_merge",
+        name="diamond_merge",
+        root_txid=merge_txid,
+        related_txids=[merge_txid, left_txid, right_txid, parent_txid],
     )
 
-    # 3) Fan-in consolidation (20+ inputs -> 1 output).
-    fan_in_inputs = [take_utxo() for _ in range(fan_count)]
+
+def build_fan_in(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    address_pool: AddressPool,
+    seeds: list[dict[str, Any]],
+) -> dict[str, Any]:
+    fan_count = len(seeds)
     fan_in_txid, _ = spend_inputs(
-        cli,
-        cli_json,
-        wallet=wallet_graph,
-        inputs=fan_in_inputs,
-        output_values=[sum(x["value_sat"] for x in fan_in_inputs) - (fan_count * PER_TX_FEE_SAT)],
+        handle,
+        wallet=wallet,
+        inputs=seeds,
+        output_values=[sum(x["value_sat"] for x in seeds) - (fan_count * PER_TX_FEE_SAT)],
+        dest_addrs=address_pool.take(1),
     )
-    mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-    scenarios.append(
-        {
-            "name": f"fan_in_{fan_count}",
-            "description": f"Consolidation transaction spending {fan_count} inputs.",
-            "root_txid": fan_in_txid,
-            "related_txids": [fan_in_txid] + [x["txid"] for x in fan_in_inputs],
-            "suggested_ui_checks": [
-                "Root has many incoming ancestry edges.",
-                "Check performance on wide incoming edge sets.",
-            ],
-            "why_interesting": "Exercises dense input fan-in rendering.",
-            "ui_focus": "Inspect edge count and node detail stability.",
-        }
+    return scenario_record(
+        "fan_in",
+        name=f"fan_in_{fan_count}",
+        root_txid=fan_in_txid,
+        related_txids=[fan_in_txid] + [x["txid"] for x in seeds],
+        count=fan_count,
     )
 
-    # 4) Fan-out payout (1 input -> 20+ outputs).
-    fan_out_input = take_utxo()
-    fan_out_each = (fan_out_input["value_sat"] - PER_TX_FEE_SAT) // fan_count
-    fan_out_values = [fan_out_each for _ in range(fan_count)]
-    fan_out_txid, fan_out_outs = spend_inputs(
-        cli,
-        cli_json,
-        wallet=wallet_graph,
-        inputs=[fan_out_input],
-        output_values=fan_out_values,
+
+def build_fan_out(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    address_pool: AddressPool,
+    seed: dict[str, Any],
+    fan_count: int,
+) -> dict[str, Any]:
+    fan_out_each = (seed["value_sat"] - PER_TX_FEE_SAT) // fan_count
+    fan_out_txid, _ = spend_inputs(
+        handle,
+        wallet=wallet,
+        inputs=[seed],
+        output_values=[fan_out_each] * fan_count,
+        dest_addrs=address_pool.take(fan_count),
     )
-    mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-    scenarios.append(
-        {
-            "name": f"fan_out_{fan_count}",
-            "description": f"Single-input payout creating {fan_count} outputs.",
-            "root_txid": fan_out_txid,
-            "related_txids": [fan_out_txid, fan_out_input["txid"]],
-            "suggested_ui_checks": [
-                "Root has one parent in ancestry despite many outputs.",
-                "Node detail should show large output list cleanly.",
-            ],
-            "why_interesting": "Shows output-heavy tx detail handling.",
-            "ui_focus": "Inspect output rendering and labeling controls.",
-        }
+    return scenario_record(
+        "fan_out",
+        name=f"fan_out_{fan_count}",
+        root_txid=fan_out_txid,
+        related_txids=[fan_out_txid, seed["txid"]],
+        count=fan_count,
     )
 
-    # 5) Coinjoin-like equal-output transaction.
-    coinjoin_inputs = [take_utxo() for _ in range(equal_count)]
-    equal_value = (sum(i["value_sat"] for i in coinjoin_inputs) - (equal_count * PER_TX_FEE_SAT)) // equal_count
-    coinjoin_values = [equal_value for _ in range(equal_count)]
+
+def build_coinjoin_like(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    address_pool: AddressPool,
+    seeds: list[dict[str, Any]],
+) -> dict[str, Any]:
+    equal_count = len(seeds)
+    equal_value = (sum(i["value_sat"] for i in seeds) - (equal_count * PER_TX_FEE_SAT)) // equal_count
     coinjoin_txid, _ = spend_inputs(
-        cli,
-        cli_json,
-        wallet=wallet_graph,
-        inputs=coinjoin_inputs,
-        output_values=coinjoin_values,
+        handle,
+        wallet=wallet,
+        inputs=seeds,
+        output_values=[equal_value] * equal_count,
+        dest_addrs=address_pool.take(equal_count),
     )
-    mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-    scenarios.append(
-        {
-            "name": f"coinjoin_like_equal_outputs_{equal_count}",
-            "description": "Multi-input transaction with equal-valued outputs.",
-            "root_txid": coinjoin_txid,
-            "related_txids": [coinjoin_txid] + [x["txid"] for x in coinjoin_inputs],
-            "suggested_ui_checks": [
-                "Equal output amounts are visible in tx detail.",
-                "No heuristic claims should imply deterministic linkage.",
-            ],
-            "why_interesting": "Resembles common collaborative spend patterns.",
-            "ui_focus": "Verify value symmetry and neutral interpretation.",
-        }
+    return scenario_record(
+        "coinjoin_like",
+        name=f"coinjoin_like_equal_outputs_{equal_count}",
+        root_txid=coinjoin_txid,
+        related_txids=[coinjoin_txid] + [x["txid"] for x in seeds],
     )
 
-    # 6) CPFP-style pair (parent + child), intentionally left unconfirmed.
-    cpfp_parent_in = take_utxo()
+
+def build_cpfp_parent_child(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    address_pool: AddressPool,
+    seed: dict[str, Any],
+) -> dict[str, Any]:
+    # The child must reach the mempool while its parent is still unconfirmed,
+    # so the caller builds this pair on its own thread with nothing else
+    # mining; both then stay in the mempool until the block RBF mines.
     cpfp_parent_txid, cpfp_parent_out = spend_inputs(
-        cli,
-        cli_json,
-        wallet=wallet_graph,
-        inputs=[cpfp_parent_in],
-        output_values=[cpfp_parent_in["value_sat"] - 5_000],
+        handle,
+        wallet=wallet,
+        inputs=[seed],
+        output_values=[seed["value_sat"] - 5_000],
+        dest_addrs=address_pool.take(1),
     )
     cpfp_child_txid, _ = spend_inputs(
-        cli,
-        cli_json,
-        wallet=wallet_graph,
+        handle,
+        wallet=wallet,
         inputs=cpfp_parent_out,
         output_values=[cpfp_parent_out[0]["value_sat"] - 25_000],
+        dest_addrs=address_pool.take(1),
     )
-    scenarios.append(
-        {
-            "name": "cpfp_parent_child",
-            "description": "Unconfirmed parent with child paying a higher fee.",
-            "root_txid": cpfp_child_txid,
-            "related_txids": [cpfp_child_txid, cpfp_parent_txid],
-            "suggested_ui_checks": [
-                "Root ancestry includes the unconfirmed parent.",
-                "Fee and feerate differ notably between parent and child.",
-            ],
-            "why_interesting": "Shows package-like ancestor relationships.",
-            "ui_focus": "Compare fee metrics parent vs child.",
-        }
+    return scenario_record(
+        "cpfp_parent_child",
+        name="cpfp_parent_child",
+        root_txid=cpfp_child_txid,
+        related_txids=[cpfp_child_txid, cpfp_parent_txid],
     )
-    mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
 
-    # 7) RBF-signaling transaction and replacement.
+
+def build_op_return_payload(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    address_pool: AddressPool,
+    seed: dict[str, Any],
+) -> dict[str, Any]:
+    [opret_pay_addr] = address_pool.take(1)
+    opret_txid = send_raw_with_outputs(
+        handle,
+        wallet=wallet,
+        inputs=[seed],
+        outputs={opret_pay_addr: sat_to_btc(seed["value_sat"] - 8_000)},
+        op_return_data_hex="636f72792d75692d66697874757265",
+    )
+    return scenario_record(
+        "op_return_payload",
+        name="op_return_payload",
+        root_txid=opret_txid,
+        related_txids=[opret_txid],
+    )
+
+
+def build_deep_chain(
+    handle: RegtestHandle,
+    *,
+    wallet: str,
+    address_pool: AddressPool,
+    mine_addr: str,
+    seed: dict[str, Any],
+    long_depth: int,
+) -> dict[str, Any]:
+    # Drafted and signed locally in one pass, then broadcast a mempool
+    # chain limit at a time; the tail is confirmed by the caller's next
+    # block.
+    deep_txids = spend_chain(
+        handle,
+        wallet=wallet,
+        seed=seed,
+        dest_addrs=address_pool.take(long_depth),
+        mine_addr=mine_addr,
+    )
+    return scenario_record(
+        "deep_chain",
+        name=f"deep_chain_{long_depth}_for_truncation",
+        root_txid=deep_txids[-1],
+        related_txids=[deep_txids[-1], deep_txids[-2], deep_txids[0]],
+    )
+
+
+def build_scenarios(
+    *,
+    handle: RegtestHandle,
+    wallet_graph: str,
+    wallet_miner: str,
+    mine_addr: str,
+    profile: str,
+) -> list[dict[str, Any]]:
+    profile_cfg = {
+        "fast": {"fan": 20, "equal": 5, "long_depth": 52, "seed_count": 120},
+        "balanced": {"fan": 24, "equal": 6, "long_depth": 60, "seed_count": 120},
+        "rich": {"fan": 40, "equal": 10, "long_depth": 80, "seed_count": 1_000},
+    }
+    cfg = profile_cfg[profile]
+    fan_count = cfg["fan"]
+    equal_count = cfg["equal"]
+    long_depth = cfg["long_depth"]
+    seed_count = cfg["seed_count"]
+
+    # We pre-fund many small UTXOs to keep scenario construction deterministic and
+    # independent from wallet coin selection. Draws come off the front through
+    # a cursor, so a multi-seed scenario reserves its whole block with one
+    # bounds check and one slice.
+    utxos = fund_wallet_utxos(
+        handle,
+        source_wallet=wallet_miner,
+        dest_wallet=wallet_graph,
+        mine_addr=mine_addr,
+        count=seed_count,
+        value_sat=100_000_000,
+    )
+    next_utxo = 0
+
+    def take_utxos(count: int) -> list[dict[str, Any]]:
+        nonlocal next_utxo
+        end = next_utxo + count
+        if end > len(utxos):
+            raise RuntimeError("not enough funded UTXOs for scenario generation")
+        reserved = utxos[next_utxo:end]
+        next_utxo = end
+        return reserved
+
+    def take_utxo() -> dict[str, Any]:
+        return take_utxos(1)[0]
+
+    # Shared by all builders; refilling it a hundred addresses at a time
+    # takes `getnewaddress` off the per-spend critical path.
+    address_pool = AddressPool(handle, wallet=wallet_graph)
+    wallets = {"wallet": wallet_graph, "address_pool": address_pool}
+
+    # Seeds are reserved on this thread in the original draw order, so the
+    # builders never share an outpoint and can run concurrently. CPFP and RBF
+    # depend on mempool state: the CPFP child must be sent while its parent
+    # is unconfirmed, and the RBF replacement while its original is. The
+    # deep chain mines a block between its bursts, so both run serially on
+    # this thread once the pool has drained, CPFP first, and nothing mines
+    # between their broadcasts.
+    #
+    # Which block confirms what: a pooled transaction broadcast before one
+    # of the deep chain's in-pool blocks is confirmed by it; everything
+    # still in the mempool afterwards (the deep chain's last burst, late
+    # pooled spends, the CPFP pair and the RBF winner) is confirmed together
+    # by the one block RBF mines.
+    early_jobs: list[tuple[Callable[..., dict[str, Any]], dict[str, Any]]] = [
+        (build_simple_chain_4, {"seed": take_utxo()}),
+        (build_diamond_merge, {"seed": take_utxo()}),
+        (build_fan_in, {"seeds": take_utxos(fan_count)}),
+        (build_fan_out, {"seed": take_utxo(), "fan_count": fan_count}),
+        (build_coinjoin_like, {"seeds": take_utxos(equal_count)}),
+    ]
+    cpfp_input = take_utxo()
     rbf_input = take_utxo()
-    rbf_addr_1 = cli(["getnewaddress", "", "bech32"], rpc_wallet=wallet_graph)
-    rbf_addr_2 = cli(["getnewaddress", "", "bech32"], rpc_wallet=wallet_graph)
-    rbf_txid_1 = send_raw_with_outputs(
-        cli,
-        cli_json,
+    late_jobs: list[tuple[Callable[..., dict[str, Any]], dict[str, Any]]] = [
+        (build_op_return_payload, {"seed": take_utxo()}),
+        (
+            build_deep_chain,
+            {"seed": take_utxo(), "long_depth": long_depth, "mine_addr": mine_addr},
+        ),
+    ]
+
+    with ThreadPoolExecutor(
+        max_workers=SCENARIO_WORKERS, thread_name_prefix="ui-scenario"
+    ) as pool:
+        early = [pool.submit(builder, handle, **wallets, **kwargs) for builder, kwargs in early_jobs]
+        late = [pool.submit(builder, handle, **wallets, **kwargs) for builder, kwargs in late_jobs]
+        # Collected in submission order so the catalog does not depend on
+        # thread scheduling.
+        scenarios = [future.result() for future in early]
+        late_scenarios = [future.result() for future in late]
+
+    # 6) CPFP-style pair (parent + child), left unconfirmed until RBF's block.
+    scenarios.append(build_cpfp_parent_child(handle, **wallets, seed=cpfp_input))
+
+    # 7) RBF-signaling transaction and replacement.
+    rbf_addr_1, rbf_addr_2 = address_pool.take(2)
+    # Both versions spend the same input, so they are created and signed
+    # together before the original is broadcast.
+    rbf_hex_1, rbf_hex_2 = sign_raw_transactions(
+        handle,
         wallet=wallet_graph,
-        inputs=[rbf_input],
-        outputs={rbf_addr_1: sat_to_btc(rbf_input["value_sat"] - 5_000)},
-        sequence=0xFFFFFFFD,
+        drafts=[
+            raw_tx_params(
+                [rbf_input],
+                {rbf_addr_1: sat_to_btc(rbf_input["value_sat"] - 5_000)},
+                sequence=0xFFFFFFFD,
+            ),
+            raw_tx_params(
+                [rbf_input],
+                {rbf_addr_2: sat_to_btc(rbf_input["value_sat"] - 25_000)},
+                sequence=0xFFFFFFFD,
+            ),
+        ],
     )
+    rbf_txid_1 = broadcast_signed(handle, wallet=wallet_graph, signed_hex=rbf_hex_1)
     try:
-        rbf_txid_2 = send_raw_with_outputs(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
-            inputs=[rbf_input],
-            outputs={rbf_addr_2: sat_to_btc(rbf_input["value_sat"] - 25_000)},
-            sequence=0xFFFFFFFD,
-        )
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
+        rbf_txid_2 = broadcast_signed(handle, wallet=wallet_graph, signed_hex=rbf_hex_2)
+        handle.generate(1, mine_addr)
         scenarios.append(
-            {
-                "name": "rbf_replacement",
-                "description": "RBF-signaling transaction replaced by a higher-fee spend.",
-                "root_txid": rbf_txid_2,
-                "related_txids": [rbf_txid_1, rbf_txid_2],
-                "label_txids": [rbf_txid_2],
-                "suggested_ui_checks": [
-                    "Replacement tx appears as current spend of the same outpoint.",
-                    "RBF signaling metadata is visible on the replacement path.",
-                ],
-                "why_interesting": "Validates replaceability and mempool replacement behavior.",
-                "ui_focus": "Inspect sequence-based signaling and tx history context.",
-            }
+            scenario_record(
+                "rbf_replacement",
+                name="rbf_replacement",
+                root_txid=rbf_txid_2,
+                related_txids=[rbf_txid_1, rbf_txid_2],
+                label_txids=[rbf_txid_2],
+            )
         )
     except Exception as exc:
         log(f"WARNING: RBF replacement failed (mempool policy may reject BIP125): {exc}")
         log("Skipping rbf_replacement scenario — mine original tx instead.")
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
+        handle.generate(1, mine_addr)
         scenarios.append(
-            {
-                "name": "rbf_original_only",
-                "description": "RBF-signaling transaction (replacement was rejected by mempool policy).",
-                "root_txid": rbf_txid_1,
-                "related_txids": [rbf_txid_1],
-                "suggested_ui_checks": [
-                    "RBF signaling metadata is visible on the original tx.",
-                ],
-                "why_interesting": "Shows RBF signaling even when replacement is unavailable.",
-                "ui_focus": "Inspect sequence-based signaling.",
-            }
+            scenario_record(
+                "rbf_original_only",
+                name="rbf_original_only",
+                root_txid=rbf_txid_1,
+                related_txids=[rbf_txid_1],
+            )
         )
 
-    # 8) OP_RETURN-carrying transaction.
-    opret_input = take_utxo()
-    opret_pay_addr = cli(["getnewaddress", "", "bech32"], rpc_wallet=wallet_graph)
-    opret_txid = send_raw_with_outputs(
-        cli,
-        cli_json,
-        wallet=wallet_graph,
-        inputs=[opret_input],
-        outputs={opret_pay_addr: sat_to_btc(opret_input["value_sat"] - 8_000)},
-        op_return_data_hex="636f72792d75692d66697874757265",
-    )
-    mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-    scenarios.append(
-        {
-            "name": "op_return_payload",
-            "description": "Transaction includes an OP_RETURN data output.",
-            "root_txid": opret_txid,
-            "related_txids": [opret_txid],
-            "suggested_ui_checks": [
-                "Output script classification includes OP_RETURN.",
-                "Data-carrying output does not break graph or label UI.",
-            ],
-            "why_interesting": "Covers non-spendable output script types.",
-            "ui_focus": "Confirm script type enrichment and output listing.",
-        }
-    )
-
-    # 9) Long chain exceeding default graph depth (50).
-    deep_out = [take_utxo()]
-    deep_txids: list[str] = []
-    for idx in range(long_depth):
-        deep_txid, deep_out = spend_inputs(
-            cli,
-            cli_json,
-            wallet=wallet_graph,
-            inputs=deep_out,
-            output_values=[deep_out[0]["value_sat"] - PER_TX_FEE_SAT],
-        )
-        deep_txids.append(deep_txid)
-        if (idx + 1) % 20 == 0:
-            mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-    mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
-    scenarios.append(
-        {
-            "name": f"deep_chain_{long_depth}_for_truncation",
-            "description": "Long ancestry chain meant to exceed default max_depth=50.",
-            "root_txid": deep_txids[-1],
-            "related_txids": [deep_txids[-1], deep_txids[-2], deep_txids[0]],
-            "suggested_ui_checks": [
-                "Default graph request reports truncated=true.",
-                "Increasing max_depth query parameter reveals deeper ancestry.",
-            ],
-            "why_interesting": "Demonstrates limit-driven truncation behavior.",
-            "ui_focus": "Check truncated flag and depth stats in API response.",
-        }
-    )
+    # 8) OP_RETURN-carrying transaction and 9) long chain exceeding the
+    # default graph depth (50), both built above.
+    scenarios.extend(late_scenarios)
 
     # 10) Rich-profile only: extreme dense DAG with many sweep-style
     # consolidations and cross-layer joins.
@@ -608,6 +871,10 @@ def build_scenarios(
             if not pool:
                 raise RuntimeError("cannot pop from an empty outpoint pool")
             idx = cursor % len(pool)
+            # Unlike the seed draws, this removes from the middle on purpose:
+            # the interleaving is what weaves the lattice. A swap-remove would
+            # be O(1) but reorder the pool and change the generated graph,
+            # and the shift is at most a few hundred pointers.
             outpoint = pool.pop(idx)
             return outpoint, cursor + stride
 
@@ -664,24 +931,24 @@ def build_scenarios(
                 output_values = split_outputs(output_total, output_count)
 
                 txid, tx_outs = spend_inputs(
-                    cli,
-                    cli_json,
+                    handle,
                     wallet=wallet_graph,
                     inputs=selected_inputs,
                     output_values=output_values,
+                    dest_addrs=address_pool.take(output_count),
                 )
                 layer_txids.append(txid)
                 next_layer_outs.extend(tx_outs)
                 total_chaos_txs += 1
 
                 if total_chaos_txs % 16 == 0:
-                    mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
+                    handle.generate(1, mine_addr)
 
             chaos_layers.append(layer_txids)
             two_layers_back_outs = prev_layer_outs
             prev_layer_outs = next_layer_outs
 
-        mine_to_wallet(cli, wallet=wallet_miner, blocks=1)
+        handle.generate(1, mine_addr)
 
         if not chaos_layers or not chaos_layers[-1]:
             raise RuntimeError("chaos scenario generation produced no root transaction")
@@ -690,96 +957,89 @@ def build_scenarios(
         chaos_related = dedupe_preserve_order([chaos_root_txid, *layer_anchors])
 
         scenarios.append(
-            {
-                "name": "chaos_sweep_matrix_21x5_rich",
-                "description": (
-                    "21-layer cross-woven sweep lattice with 435 transactions and "
-                    "high edge density under default graph limits."
-                ),
-                "root_txid": chaos_root_txid,
-                "related_txids": chaos_related,
-                "label_txids": [chaos_root_txid],
-                "suggested_ui_checks": [
-                    "Graph remains navigable despite very dense merge/sweep ancestry.",
-                    "Cross-layer joins create non-local edges that still preserve traceability.",
-                    "High-input transactions keep node details and label editor responsive.",
-                ],
-                "why_interesting": "Maximum-complexity manual fixture for UI ancestry readability.",
-                "ui_focus": "Traceability under extreme edge density and repeated sweep patterns.",
-            }
+            scenario_record(
+                "chaos_sweep_matrix",
+                name="chaos_sweep_matrix_21x5_rich",
+                root_txid=chaos_root_txid,
+                related_txids=chaos_related,
+                label_txids=[chaos_root_txid],
+            )
         )
 
     return scenarios
 
 
-def print_scenario_table(scenarios: list[dict[str, Any]]) -> None:
-    print()
-    print("Scenario Catalog")
-    print("=" * 130)
-    print(f"{'name':<36} {'root txid':<64} {'why interesting':<32} {'what to look for in UI'}")
-    print("-" * 130)
-    for s in scenarios:
-        print(
-            f"{s['name']:<36} {s['root_txid']:<64} {s['why_interesting']:<32} {s['ui_focus']}"
-        )
-    print("-" * 130)
+def scenario_table_lines(scenarios: list[dict[str, Any]]) -> list[str]:
+    lines = [
+        "",
+        "Scenario Catalog",
+        "=" * 130,
+        SCENARIO_TABLE_HEADER,
+        "-" * 130,
+    ]
+    lines.extend(SCENARIO_ROW_FMT.format_map(s) for s in scenarios)
+    lines.append("-" * 130)
+    return lines
 
 
-def print_examples(
+def example_lines(
     server_url: str,
     api_token: str,
     scenarios: list[dict[str, Any]],
     labels_info: LabelPackInfo,
-) -> None:
-    """Print example commands using `X-API-Token` authentication."""
-    deep = next(s for s in scenarios if s["name"].startswith("deep_chain_"))
-    diamond = next(s for s in scenarios if s["name"] == "diamond_merge")
-    chaos = next((s for s in scenarios if s["name"] == "chaos_sweep_matrix_21x5_rich"), None)
+) -> list[str]:
+    """Return example commands using `X-API-Token` authentication."""
+    by_name = {s["name"]: s for s in scenarios}
+    # The deep chain's name carries the profile depth, so it is found by prefix.
+    deep_root = next(
+        s["root_txid"] for name, s in by_name.items() if name.startswith("deep_chain_")
+    )
+    diamond_root = by_name["diamond_merge"]["root_txid"]
+    chaos = by_name.get("chaos_sweep_matrix_21x5_rich")
     rw_file_id = labels_info["rw_file_ids"][0]
     ro_file_id = labels_info["ro_file_ids"][0]
 
-    print()
-    print("Copy/Paste Examples")
-    print("=" * 130)
-    print("1) UI walkthrough (diamond merge):")
-    print(f"   Open: {server_url}/?token={api_token}&search={diamond['root_txid']}")
-    print()
-    print("2) API check for truncation (long chain):")
-    print(
-        f"   curl -s \"{server_url}/api/v1/graph/tx/{deep['root_txid']}\" -H \"x-api-token: {api_token}\" | jq '.truncated,.stats.max_depth_reached'"
-    )
-    print()
-    print("3) Loaded persistent label files:")
-    print(
+    lines = ["", "Copy/Paste Examples", "=" * 130]
+    lines.append("1) UI walkthrough (diamond merge):")
+    lines.append(f"   Open: {server_url}/?token={api_token}&search={diamond_root}")
+    lines.append("")
+    lines.append("2) API check for truncation (long chain):")
+    lines.append(
+        f"   curl -s \"{server_url}/api/v1/graph/tx/{deep_root}\" -H \"x-api-token: {api_token}\" | jq '.truncated,.stats.max_depth_reached'"
+    )
+    lines.append("")
+    lines.append("3) Loaded persistent label files:")
+    lines.append(
         f"   curl -s \"{server_url}/api/v1/label\" -H \"x-api-token: {api_token}\" | jq '.[] | {{id,name,kind,editable,record_count}}'"
     )
-    print()
-    print("4) Graph labels check (tx/input/output/address buckets):")
-    print(
-        f"   curl -s \"{server_url}/api/v1/graph/tx/{diamond['root_txid']}\" -H \"x-api-token: {api_token}\" | jq '.labels_by_type | to_entries | map({{type: .key, refs: (.value | length)}})'"
+    lines.append("")
+    lines.append("4) Graph labels check (tx/input/output/address buckets):")
+    lines.append(
+        f"   curl -s \"{server_url}/api/v1/graph/tx/{diamond_root}\" -H \"x-api-token: {api_token}\" | jq '.labels_by_type | to_entries | map({{type: .key, refs: (.value | length)}})'"
     )
-    print()
-    print("5) Mutating API example (persistent RW file should succeed):")
-    print(
+    lines.append("")
+    lines.append("5) Mutating API example (persistent RW file should succeed):")
+    lines.append(
         "   curl -s -X POST "
         f"\"{server_url}/api/v1/label/{rw_file_id}\" "
         f"-H \"x-api-token: {api_token}\" "
         "-H \"content-type: application/json\" "
-        f"-d '{{\"type\":\"tx\",\"ref\":\"{deep['root_txid']}\",\"label\":\"manual-fixture-rw\"}}' | jq"
+        f"-d '{{\"type\":\"tx\",\"ref\":\"{deep_root}\",\"label\":\"manual-fixture-rw\"}}' | jq"
     )
-    print()
-    print("6) Mutating API example (persistent RO file should fail read-only):")
-    print(
+    lines.append("")
+    lines.append("6) Mutating API example (persistent RO file should fail read-only):")
+    lines.append(
         "   curl -s -X POST "
         f"\"{server_url}/api/v1/label/{ro_file_id}\" "
         f"-H \"x-api-token: {api_token}\" "
         "-H \"content-type: application/json\" "
-        f"-d '{{\"type\":\"tx\",\"ref\":\"{deep['root_txid']}\",\"label\":\"manual-fixture-ro\"}}' | jq"
+        f"-d '{{\"type\":\"tx\",\"ref\":\"{deep_root}\",\"label\":\"manual-fixture-ro\"}}' | jq"
     )
     if chaos is not None:
-        print()
-        print("7) UI stress walkthrough (chaos sweep matrix):")
-        print(f"   Open: {server_url}/?token={api_token}&search={chaos['root_txid']}")
+        lines.append("")
+        lines.append("7) UI stress walkthrough (chaos sweep matrix):")
+        lines.append(f"   Open: {server_url}/?token={api_token}&search={chaos['root_txid']}")
+    return lines
 
 
 def parse_args() -> argparse.Namespace:
@@ -823,12 +1083,17 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Fixture output path (default: tmp/ui_manual_fixture-<run_id>.json).",
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the fixture JSON for reading (default: compact).",
+    )
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
-    root_dir = Path(__file__).resolve().parent.parent.parent
+    root_dir = ROOT_DIR
     cfg = make_config(root_dir)
 
     port = args.port or pick_free_port()
@@ -842,23 +1107,33 @@ def main() -> int:
     handle = start_bitcoind(cfg)
     cory_proc = None
     cory_log_file = None
-    interrupted = False
-
-    def mark_interrupt(_signum, _frame) -> None:
-        nonlocal interrupted
-        interrupted = True
-
-    previous_sigint = signal.signal(signal.SIGINT, mark_interrupt)
+    build_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cory-build")
+
+    def defer_interrupt(_signum, _frame) -> None:
+        # Ctrl+C is recorded through the wakeup pipe below; the handler only
+        # keeps it from raising `KeyboardInterrupt` in the middle of setup.
+        pass
+
+    # Python's C-level signal handler writes the signal number to the wakeup
+    # fd as the signal arrives, so a Ctrl+C at any point from here on, during
+    # setup included, is waiting in the pipe when the hold below reads it.
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_w, False)
+    previous_sigint = signal.signal(signal.SIGINT, defer_interrupt)
+    previous_wakeup_fd = signal.set_wakeup_fd(wake_w)
     try:
+        # cory's label directories come from the scenarios, so it cannot
+        # start early the way it does in `server_e2e.py`; its build, the
+        # longest part of a cold start, overlaps the chain setup instead.
+        cory_build = build_pool.submit(build_cory, root_dir)
+
         log("creating UI fixture wallets")
-        handle.cli(["createwallet", args.wallet_miner])
-        handle.cli(["createwallet", args.wallet_graph])
+        create_wallets(handle, args.wallet_miner, args.wallet_graph)
 
-        mine_addr = mine_to_wallet(handle.cli, wallet=args.wallet_miner, blocks=130)
+        mine_addr = mine_to_wallet(handle, wallet=args.wallet_miner, blocks=130)
         log(f"building manual scenarios profile={args.profile}")
         scenarios = build_scenarios(
-            cli=handle.cli,
-            cli_json=handle.cli_json,
+            handle=handle,
             wallet_graph=args.wallet_graph,
             wallet_miner=args.wallet_miner,
             mine_addr=mine_addr,
@@ -868,7 +1143,7 @@ def main() -> int:
             root_dir=root_dir,
             tmp_dir=cfg.tmp_dir,
             run_id=cfg.run_id,
-            cli_json=handle.cli_json,
+            handle=handle,
             scenarios=scenarios,
         )
         log(
@@ -876,6 +1151,7 @@ def main() -> int:
             f"rw={labels_info['rw_dir_display']} ro={labels_info['ro_dir_display']}"
         )
 
+        cory_build.result()
         rpc_url = f"http://127.0.0.1:{cfg.rpc_port}"
         cory_proc, cory_log_file, server_url, api_token = start_cory(
             root_dir=root_dir,
@@ -913,34 +1189,50 @@ def main() -> int:
                 for s in scenarios
             ],
         }
-        fixture_file.write_text(json.dumps(fixture, indent=2), encoding="utf-8")
-
-        print()
-        print(f"Run ID:      {cfg.run_id}")
-        print(f"Server URL:  {server_url}")
-        print(f"Fixture:     {fixture_file}")
-        print(f"bitcoind log:{cfg.bitcoind_log}")
-        print(f"cory log:    {cory_log}")
-        print(f"labels rw:   {labels_info['rw_dir_display']}")
-        print(f"labels ro:   {labels_info['ro_dir_display']}")
-
-        print_scenario_table(scenarios)
-        print_examples(server_url, api_token, scenarios, labels_info)
-
-        print()
-        print("Shutdown")
-        print("=" * 130)
+        write_json_file(fixture_file, fixture, pretty=args.pretty)
+
+        # The whole report goes out in one write and is flushed before the
+        # session blocks, so a piped stdout is not left holding it.
+        report = [
+            "",
+            f"Run ID:      {cfg.run_id}",
+            f"Server URL:  {server_url}",
+            f"Fixture:     {fixture_file}",
+            f"bitcoind log:{cfg.bitcoind_log}",
+            f"cory log:    {cory_log}",
+            f"labels rw:   {labels_info['rw_dir_display']}",
+            f"labels ro:   {labels_info['ro_dir_display']}",
+            *scenario_table_lines(scenarios),
+            *example_lines(server_url, api_token, scenarios, labels_info),
+            "",
+            "Shutdown",
+            "=" * 130,
+            "No-hold mode enabled; exiting after setup."
+            if args.no_hold
+            else "Manual session is live. Press Ctrl+C in this terminal to stop cory and bitcoind.",
+        ]
+        sys.stdout.write("\n".join(report) + "\n")
+        sys.stdout.flush()
         if args.no_hold:
-            print("No-hold mode enabled; exiting after setup.")
             return 0
 
-        print("Manual session is live. Press Ctrl+C in this terminal to stop cory and bitcoind.")
-        while not interrupted:
-            time.sleep(0.25)
+        # Block in the kernel on the wakeup pipe rather than checking a flag
+        # and then calling `signal.pause()`: a Ctrl+C landing between the
+        # check and the pause would be consumed by the handler and leave the
+        # pause waiting for a second one. The pipe keeps the byte until it is
+        # read, so there is no window to lose it in.
+        while os.read(wake_r, 1) != bytes([signal.SIGINT]):
+            pass
         print("Received Ctrl+C, shutting down...")
         return 0
     finally:
+        signal.set_wakeup_fd(previous_wakeup_fd)
         signal.signal(signal.SIGINT, previous_sigint)
+        os.close(wake_r)
+        os.close(wake_w)
+        # A failed setup still waits for a running build rather than leaving
+        # cargo behind; its outcome no longer matters.
+        build_pool.shutdown()
         if cory_proc is not None:
             stop_process(cory_proc, name="cory")
         if cory_log_file is not None:
@@ -9,14 +9,18 @@ The implementation is split into focused modules:
 from __future__ import annotations
 
 import argparse
-import json
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
+import os
+import shutil
 import signal
 import sys
 from pathlib import Path
 from typing import Any
 
 # scripts/ui/playwright/ -> scripts/
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
 
 try:
     # Import check is kept here so the script exits with a direct installation
@@ -32,14 +36,20 @@ except ImportError:
 from playwright.sync_api import sync_playwright  # noqa: E402
 
 from common import (  # noqa: E402
+    RpcError,
+    create_wallets,
+    json_decode,
+    json_encode,
     log,
     make_config,
     mine_to_wallet,
     pick_free_port,
+    run,
     start_bitcoind,
     start_cory,
     stop_process,
     wait_for_health,
+    write_json_file,
 )
 from ui.manual_fixtures import build_scenarios  # noqa: E402
 from ui.playwright.label_cases import build_tests  # noqa: E402
@@ -55,18 +65,76 @@ def generate_import_fixture(scenarios: list[dict[str, Any]]) -> Path:
     path = fixture_path()
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    simple = next(s for s in scenarios if s["name"] == "simple_chain_4")
-    diamond = next(s for s in scenarios if s["name"] == "diamond_merge")
+    by_name = {s["name"]: s for s in scenarios}
+    simple = by_name["simple_chain_4"]
+    diamond = by_name["diamond_merge"]
 
-    lines = [
-        json.dumps({"type": "tx", "ref": simple["root_txid"], "label": "e2e-label-0"}),
-        json.dumps({"type": "tx", "ref": diamond["root_txid"], "label": "e2e-label-1"}),
+    records = [
+        {"type": "tx", "ref": simple["root_txid"], "label": "e2e-label-0"},
+        {"type": "tx", "ref": diamond["root_txid"], "label": "e2e-label-1"},
     ]
-    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
-    log(f"wrote import fixture: {path} ({len(lines)} records)")
+    # Compact records streamed line by line through one buffer, so the
+    # fixture never materialises as a single joined string if it grows.
+    with path.open("wb", buffering=64 * 1024) as f:
+        for record in records:
+            f.write(json_encode(record))
+            f.write(b"\n")
+    log(f"wrote import fixture: {path} ({len(records)} records)")
     return path
 
 
+# ==============================================================================
+# Warm chain cache
+# ==============================================================================
+
+# The scenarios only depend on the code that builds them, so a cached chain is
+# keyed on these sources and an edited builder never reuses an older chain.
+# This file is one of them: `main` picks the wallets, the mined block count
+# and the `build_scenarios` arguments. The bitcoind version is part of the key
+# too: a datadir written by a newer node may not open in an older one, and
+# block/wallet formats change.
+WARM_CACHE_SOURCES = (
+    SCRIPTS_DIR / "common.py",
+    SCRIPTS_DIR / "ui" / "manual_fixtures.py",
+    Path(__file__).resolve(),
+)
+WALLETS = ("e2e_miner", "e2e_graph")
+
+
+def warm_cache_dir(tmp_dir: Path, profile: str) -> Path:
+    digest = hashlib.sha256()
+    digest.update(run(["bitcoind", "-version"]).stdout.partition("\n")[0].encode("utf-8"))
+    for source in WARM_CACHE_SOURCES:
+        digest.update(source.read_bytes())
+    return tmp_dir / f"label-e2e-warm-{profile}-{digest.hexdigest()[:16]}"
+
+
+def prune_warm_caches(cache_dir: Path) -> None:
+    # Each source edit or bitcoind upgrade changes the key, and a datadir copy
+    # is large, so older caches for this profile are dropped when a new one
+    # lands. Other runs' `.partial-*` staging directories are left alone.
+    prefix = cache_dir.name.rsplit("-", 1)[0] + "-"
+    for old in cache_dir.parent.glob(f"{prefix}*"):
+        if old.name != cache_dir.name and ".partial-" not in old.name:
+            shutil.rmtree(old, ignore_errors=True)
+            log(f"removed stale warm chain cache: {old}")
+
+
+def save_warm_cache(cache_dir: Path, datadir: Path, scenarios: list[dict[str, Any]]) -> None:
+    # Staged under a private name and renamed into place, so an interrupted
+    # copy or a concurrent run never leaves a half-written cache behind.
+    staging = cache_dir.with_name(f"{cache_dir.name}.partial-{os.getpid()}")
+    try:
+        shutil.copytree(datadir, staging / "datadir")
+        write_json_file(staging / "scenarios.json", scenarios)
+        prune_warm_caches(cache_dir)
+        staging.rename(cache_dir)
+        log(f"saved warm chain cache: {cache_dir}")
+    except OSError as exc:
+        log(f"WARNING: could not save warm chain cache: {exc}")
+        shutil.rmtree(staging, ignore_errors=True)
+
+
 # ==============================================================================
 # CLI + main orchestration
 # ==============================================================================
@@ -82,6 +150,16 @@ def parse_args() -> argparse.Namespace:
         default="fast",
         help="Fixture size profile (default: fast).",
     )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Rebuild the regtest chain and scenarios instead of reusing the warm cache.",
+    )
+    parser.add_argument(
+        "--no-warm-cache",
+        action="store_true",
+        help="Neither reuse nor save the warm chain cache (for throwaway tmp/ dirs, e.g. CI).",
+    )
     return parser.parse_args()
 
 
@@ -93,9 +171,20 @@ def main() -> int:
     port = pick_free_port()
     cory_log = cfg.tmp_dir / f"label_e2e_cory-{cfg.run_id}.log"
 
-    handle = start_bitcoind(cfg)
+    # Mining and scenario building dominate startup, and the label cases
+    # only read the chain, so a cleanly stopped node's datadir from an
+    # earlier run with the same fixture code is reused as is.
+    # Where `tmp/` never outlives the run, a cache can never be read back, so
+    # `--no-warm-cache` also skips the end-of-run datadir copy.
+    cache_dir = None if args.no_warm_cache else warm_cache_dir(cfg.tmp_dir, args.profile)
+    warm = cache_dir is not None and not args.fresh and (cache_dir / "scenarios.json").exists()
+    scenarios: list[dict[str, Any]] | None = None
+
+    handle = start_bitcoind(cfg, seed_datadir=cache_dir / "datadir" if warm else None)
     cory_proc = None
     cory_log_file = None
+    startup_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cory-startup")
+    cory_startup: Future[tuple[Any, Any, str, str]] | None = None
     interrupted = False
 
     def mark_interrupt(_signum, _frame):
@@ -105,26 +194,13 @@ def main() -> int:
     previous_sigint = signal.signal(signal.SIGINT, mark_interrupt)
 
     try:
-        log("creating wallets")
-        handle.cli(["createwallet", "e2e_miner"])
-        handle.cli(["createwallet", "e2e_graph"])
-
-        mine_addr = mine_to_wallet(handle.cli, wallet="e2e_miner", blocks=130)
-
-        log(f"building scenarios profile={args.profile}")
-        scenarios = build_scenarios(
-            cli=handle.cli,
-            cli_json=handle.cli_json,
-            wallet_graph="e2e_graph",
-            wallet_miner="e2e_miner",
-            mine_addr=mine_addr,
-            profile=args.profile,
-        )
-
-        generate_import_fixture(scenarios)
-
+        # As in `server_e2e.py`: cory only needs bitcoind's RPC endpoint, so
+        # its startup overlaps wallet setup and scenario building. The cases
+        # themselves stay serial; they share the label files this cory holds
+        # in memory.
         rpc_url = f"http://127.0.0.1:{cfg.rpc_port}"
-        cory_proc, cory_log_file, server_url, api_token = start_cory(
+        cory_startup = startup_pool.submit(
+            start_cory,
             root_dir=root_dir,
             connection=rpc_url,
             rpc_user=cfg.rpc_user,
@@ -133,12 +209,49 @@ def main() -> int:
             port=port,
             log_path=cory_log,
         )
+
+        if warm:
+            log(f"reusing warm chain cache: {cache_dir}")
+            # Wallets are not loaded on startup unless asked to be. One that
+            # settings.json already loaded reports RPC_WALLET_ALREADY_LOADED
+            # (-35), which is fine.
+            for result in handle.rpc_batch(
+                [("loadwallet", [wallet]) for wallet in WALLETS], return_errors=True
+            ):
+                if isinstance(result, RpcError) and result.code != -35:
+                    raise result
+            scenarios = json_decode((cache_dir / "scenarios.json").read_bytes())
+        else:
+            log("creating wallets")
+            create_wallets(handle, *WALLETS)
+
+            mine_addr = mine_to_wallet(handle, wallet="e2e_miner", blocks=130)
+
+            log(f"building scenarios profile={args.profile}")
+            scenarios = build_scenarios(
+                handle=handle,
+                wallet_graph="e2e_graph",
+                wallet_miner="e2e_miner",
+                mine_addr=mine_addr,
+                profile=args.profile,
+            )
+
+        generate_import_fixture(scenarios)
+
+        cory_proc, cory_log_file, server_url, api_token = cory_startup.result()
         wait_for_health(server_url)
         log(f"server ready: {server_url}")
 
         with sync_playwright() as pw:
             browser = pw.chromium.launch(headless=not args.headed, slow_mo=args.slowmo)
             page = browser.new_page()
+            # Init scripts run before the app's modules, so the UI reads this
+            # when it defines AUTOSAVE_DEBOUNCE_MS and saves without its 2 s
+            # debounce; the cases then wait only on the save round-trip.
+            page.add_init_script("window.__AUTOSAVE_DEBOUNCE_MS = 0;")
+            # Exports fall back to a plain download, which Playwright can
+            # capture, when the File System Access picker is missing.
+            page.add_init_script("delete window.showSaveFilePicker;")
 
             runner = E2ERunner(page=page, server_url=server_url, api_token=api_token, scenarios=scenarios)
 
@@ -153,11 +266,27 @@ def main() -> int:
 
     finally:
         signal.signal(signal.SIGINT, previous_sigint)
+        if cory_proc is None and cory_startup is not None:
+            # Setup failed while cory was still starting; wait for it so the
+            # process is not leaked. A failed startup has nothing to clean up.
+            try:
+                cory_proc, cory_log_file, _server_url, _api_token = cory_startup.result()
+            except Exception:
+                pass
+        startup_pool.shutdown()
         if cory_proc is not None:
             stop_process(cory_proc, name="cory")
         if cory_log_file is not None:
             cory_log_file.close()
         handle.stop()
+        # Only a datadir from a clean shutdown is safe to start from again.
+        if (
+            cache_dir is not None
+            and not warm
+            and scenarios is not None
+            and handle.bitcoind.returncode == 0
+        ):
+            save_warm_cache(cache_dir, cfg.datadir, scenarios)
 
 
 if __name__ == "__main__":
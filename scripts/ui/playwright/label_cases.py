@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import zipfile
-from pathlib import Path
 from typing import Callable
 
 from playwright.sync_api import expect
@@ -15,7 +14,9 @@ from ui.playwright.label_runtime import E2ERunner, fixture_path
 
 
 def test_graph_renders_after_search(r: E2ERunner) -> None:
-    r.page.goto(r.server_url)
+    # The token `fill` and the node wait below gate on the app actually
+    # rendering; waiting for `load` as well only adds the subresource tail.
+    r.page.goto(r.server_url, wait_until="domcontentloaded")
     r.ensure_api_token()
     r.search_txid(r.root_txid())
 
@@ -23,8 +24,7 @@ def test_graph_renders_after_search(r: E2ERunner) -> None:
     node_count = r.page.locator(".react-flow__node").count()
     assert node_count > 0, f"Expected graph nodes, got {node_count}"
 
-    stats = r.page.get_by_text("transactions")
-    expect(stats).to_be_visible(timeout=5000)
+    expect(r.graph_stats).to_contain_text("transactions", timeout=5000)
 
 
 def test_empty_label_state(r: E2ERunner) -> None:
@@ -38,13 +38,16 @@ def test_empty_label_state(r: E2ERunner) -> None:
 
 
 def test_export_all_no_files_alert(r: E2ERunner) -> None:
-    section = r.label_files_section()
-    with r.page.expect_event("dialog", timeout=5000) as dialog_info:
-        section.get_by_role("button", name="Export all browser labels").click()
+    r.dialogs.clear()
+    r.export_all_button.click()
 
-    dialog = dialog_info.value
-    assert dialog.message == "No browser label files to export."
-    dialog.accept()
+    r.wait_until(
+        lambda: bool(r.dialogs),
+        timeout_ms=5000,
+        step_ms=50,
+        failure_message="Export all with no files did not raise an alert",
+    )
+    assert r.dialogs == ["No browser label files to export."], f"Unexpected alerts: {r.dialogs}"
 
 
 # ==============================================================================
@@ -53,21 +56,22 @@ def test_export_all_no_files_alert(r: E2ERunner) -> None:
 
 
 def test_create_label_file(r: E2ERunner) -> None:
-    section = r.label_files_section()
-    section.get_by_placeholder("New file name").fill("test-labels")
-    section.get_by_role("button", name="Create").click()
+    r.new_file_name_input.fill("test-labels")
+    r.create_file_button.click()
 
-    created_file = section.locator("li").filter(has_text="test-labels").first
-    expect(created_file).to_be_visible(timeout=5000)
+    # The record count only renders inside a visible row, so one expect
+    # covers both the row appearing and its count.
+    created_file = r.label_file_item("test-labels").first
     expect(created_file.get_by_text("(0)")).to_be_visible(timeout=5000)
 
 
 def test_duplicate_create_fails(r: E2ERunner) -> None:
     section = r.label_files_section()
-    before = section.locator("li").filter(has_text="test-labels").count()
-    section.get_by_placeholder("New file name").fill("test-labels")
-    section.get_by_role("button", name="Create").click()
-    after = section.locator("li").filter(has_text="test-labels").count()
+    test_labels_items = r.label_file_item("test-labels")
+    before = test_labels_items.count()
+    r.new_file_name_input.fill("test-labels")
+    r.create_file_button.click()
+    after = test_labels_items.count()
     assert after == before, f"duplicate create changed file count: {before} -> {after}"
 
     # Message text may vary slightly between backend/UI versions.
@@ -80,33 +84,25 @@ def test_import_jsonl(r: E2ERunner) -> None:
     section = r.label_files_section()
     section.locator('input[type="file"]').set_input_files(str(fixture_path()))
 
-    imported_file = section.locator("li").filter(has_text="e2e_import_fixture").first
-    expect(imported_file).to_be_visible(timeout=5000)
+    imported_file = r.label_file_item("e2e_import_fixture").first
     expect(imported_file.get_by_text("(2)")).to_be_visible(timeout=5000)
 
 
 def test_duplicate_import_fails(r: E2ERunner) -> None:
     section = r.label_files_section()
-    alert_messages: list[str] = []
-    before_count = section.locator("li").filter(has_text="e2e_import_fixture").count()
-
-    def handle_dialog(dialog):
-        alert_messages.append(dialog.message)
-        dialog.accept()
-
-    r.page.on("dialog", handle_dialog)
-    try:
-        section.locator('input[type="file"]').set_input_files(str(fixture_path()))
-        # Either panel error text or alert text may appear depending on browser/UI timing.
-        panel_error = section.locator("p").filter(has_text="already exists")
-        if panel_error.count() > 0:
-            expect(panel_error.first).to_be_visible(timeout=5000)
-        after_count = section.locator("li").filter(has_text="e2e_import_fixture").count()
-        assert (
-            after_count == before_count
-        ), f"duplicate import changed fixture file count: {before_count} -> {after_count}"
-    finally:
-        r.page.remove_listener("dialog", handle_dialog)
+    fixture_items = r.label_file_item("e2e_import_fixture")
+    before_count = fixture_items.count()
+
+    section.locator('input[type="file"]').set_input_files(str(fixture_path()))
+    # Either panel error text or alert text may appear depending on browser/UI timing;
+    # the runner accepts any alert.
+    panel_error = section.locator("p").filter(has_text="already exists")
+    if panel_error.count() > 0:
+        expect(panel_error.first).to_be_visible(timeout=5000)
+    after_count = fixture_items.count()
+    assert (
+        after_count == before_count
+    ), f"duplicate import changed fixture file count: {before_count} -> {after_count}"
 
 
 # ==============================================================================
@@ -117,65 +113,47 @@ def test_duplicate_import_fails(r: E2ERunner) -> None:
 def test_node_add_label_autosave(r: E2ERunner) -> None:
     tx_card = r.selected_tx_card()
 
-    add_btn = tx_card.get_by_title("Add label").first
-    expect(add_btn).to_be_visible(timeout=5000)
-    add_btn.click()
+    # Actions auto-wait for their target to be visible and actionable, so
+    # they carry the timeouts a separate `expect(...).to_be_visible()` used to.
+    r.tx_add_label_button.first.click(timeout=5000)
 
+    # `get_attribute` only waits for the option to be attached, so the form
+    # still gets an explicit visibility check before it is read.
     select = tx_card.locator("select").first
     expect(select).to_be_visible(timeout=3000)
     first_option_value = select.locator("option").first.get_attribute("value")
     assert first_option_value, "No target file option available"
     select.select_option(first_option_value)
 
-    label_input = tx_card.get_by_placeholder("Label").first
+    label_input = r.tx_new_label_input.first
     label_input.fill("my-e2e-label")
-    tx_message = tx_card.get_by_text("Labels already exist for all editable files.")
+    tx_message = r.tx_all_labeled_message
 
-    # New-label autosave resolves by closing the add form or exhausting files.
-    r.wait_until(
-        lambda: (not r.is_visible(label_input)) or r.is_visible(tx_message),
-        timeout_ms=12000,
-        step_ms=100,
-        failure_message="Transaction-card add form did not settle after autosave",
-    )
-
-    if r.is_visible(tx_message):
-        return
-
-    inputs = tx_card.locator('input[type="text"]')
-    assert any(inputs.nth(i).input_value() == "my-e2e-label" for i in range(inputs.count())), (
-        "Expected a transaction-card input with value 'my-e2e-label'"
-    )
+    # New-label autosave resolves by turning the draft into a saved row or,
+    # when it filled the last file, by exhausting the add controls. The
+    # combined locator is polled driver-side instead of from Python.
+    saved_row = r.label_input(tx_card, "my-e2e-label")
+    expect(saved_row.or_(tx_message).first).to_be_visible(timeout=5000)
 
 
 def test_node_edit_label_autosave(r: E2ERunner) -> None:
     editor = r.selected_editor_section()
-    inputs = editor.locator('input[type="text"]')
-
-    target = None
-    for i in range(inputs.count()):
-        if inputs.nth(i).input_value() == "my-e2e-label":
-            target = inputs.nth(i)
-            break
+    target = r.label_input(editor, "my-e2e-label")
+    assert target.count() > 0, "Could not find input with value 'my-e2e-label'"
+    target.first.fill("edited-label")
 
-    assert target is not None, "Could not find input with value 'my-e2e-label'"
-    target.fill("edited-label")
-
-    expect(editor.locator('span[title="saved"]').first).to_be_visible(timeout=10000)
-    expect(target).to_have_value("edited-label", timeout=3000)
+    # The attribute follows the draft, so the edited row is matched by its
+    # new value.
+    r.wait_for_autosave_settled(editor)
+    expect(r.label_input(editor, "edited-label").first).to_have_value("edited-label", timeout=3000)
 
 
 def test_node_delete_label(r: E2ERunner) -> None:
     editor = r.selected_editor_section()
     rows = editor.locator('div:has(button[title="Delete label"])')
 
-    target_row = None
-    for i in range(rows.count()):
-        row = rows.nth(i)
-        row_input = row.locator('input[type="text"]').first
-        if row_input.count() > 0 and row_input.input_value() == "edited-label":
-            target_row = row
-            break
+    edited_rows = editor.locator('div:has(> input[data-label-value="edited-label"])')
+    target_row = edited_rows.first if edited_rows.count() > 0 else None
 
     if target_row is None:
         # If value-based matching is flaky after autosave rerenders, delete the first row.
@@ -186,52 +164,52 @@ def test_node_delete_label(r: E2ERunner) -> None:
     before = delete_buttons.count()
     target_row.get_by_title("Delete label").first.click()
 
-    r.page.wait_for_timeout(1200)
-    after = editor.get_by_title("Delete label").count()
-    assert after == max(before - 1, 0), f"Expected {before - 1}, got {after}"
+    expect(delete_buttons).to_have_count(max(before - 1, 0), timeout=5000)
 
 
 def test_all_files_labeled_message(r: E2ERunner) -> None:
     tx_card = r.selected_tx_card()
-    message = tx_card.get_by_text("Labels already exist for all editable files.")
+    message = r.tx_all_labeled_message
+    add_btn = r.tx_add_label_button
+    label_input = r.tx_new_label_input
+
+    no_more = tx_card.get_by_text("No additional editable files available.")
+    # Anything that ends one fill: the add form closing back to its idle
+    # controls, or the form reporting there is nothing left to add.
+    settled_controls = message.or_(add_btn).or_(no_more).first
 
     for attempt in range(30):
-        if r.is_visible(message):
+        state = r.tx_card_state(tx_card)
+        if state["message"]:
             return
 
-        add_btn = tx_card.get_by_title("Add label")
-        label_input = tx_card.get_by_placeholder("Label")
-        no_more = tx_card.get_by_text("No additional editable files available.")
-
-        if r.is_visible(label_input):
+        if state["input"]:
             label_input.first.fill(f"cover-file-{attempt}")
-        elif add_btn.count() > 0:
+        elif state["add"]:
             add_btn.first.click()
-            expect(label_input.first).to_be_visible(timeout=3000)
-            label_input.first.fill(f"cover-file-{attempt}")
-        elif r.is_visible(no_more):
+            label_input.first.fill(f"cover-file-{attempt}", timeout=3000)
+        elif state["no_more"]:
             pass
         else:
             break
 
-        r.wait_until(
-            lambda: r.is_visible(message) or (not r.is_visible(label_input)),
-            timeout_ms=12000,
-            step_ms=100,
-            failure_message="Transaction-card label input stayed visible; autosave did not settle",
-        )
-        if r.is_visible(message):
-            return
-        r.page.wait_for_timeout(300)
+        # The add form closes once autosave lands; the idle message only
+        # renders outside the form, so an empty input match covers it too.
+        expect(label_input).to_have_count(0, timeout=5000)
+        # The next add control renders once the saved row has settled.
+        expect(settled_controls).to_be_visible(timeout=5000)
 
     expect(message.first).to_be_visible(timeout=5000)
 
 
 def test_tx_card_exhausted_hides_add_controls(r: E2ERunner) -> None:
-    tx_card = r.selected_tx_card()
-    expect(tx_card.get_by_text("Labels already exist for all editable files.")).to_be_visible(timeout=5000)
-    assert tx_card.get_by_title("Add label").count() == 0, "Add label button should be hidden"
-    assert tx_card.get_by_placeholder("Label").count() == 0, "Add-label input should not be visible"
+    # The message lives inside the tx card, so seeing it also proves the card
+    # is there and the zero-count checks below are not vacuous.
+    expect(r.tx_all_labeled_message).to_be_visible(timeout=5000)
+    # Retrying matchers, so a control that renders late still fails the case
+    # instead of slipping past a single snapshot.
+    expect(r.tx_add_label_button).to_have_count(0, timeout=2000)
+    expect(r.tx_new_label_input).to_have_count(0, timeout=2000)
 
 
 # ==============================================================================
@@ -240,13 +218,10 @@ def test_tx_card_exhausted_hides_add_controls(r: E2ERunner) -> None:
 
 
 def test_export_label_file(r: E2ERunner) -> None:
-    section = r.label_files_section()
-
-    # Force fallback download path that Playwright can capture.
-    r.page.evaluate("delete window.showSaveFilePicker")
-
-    test_labels_li = section.locator("li").filter(has_text="test-labels")
-    export_btn = test_labels_li.get_by_role("button", name="Export")
+    # The entrypoint's init script removes `showSaveFilePicker`, so exports
+    # take the download path that Playwright can capture.
+    test_labels_li = r.label_file_item("test-labels")
+    export_btn = test_labels_li.get_by_test_id("label-file-export")
 
     with r.page.expect_download(timeout=10000) as download_info:
         export_btn.click()
@@ -254,104 +229,76 @@ def test_export_label_file(r: E2ERunner) -> None:
     download = download_info.value
     assert download.suggested_filename.endswith(".jsonl")
 
-    tmp_path = Path("tmp") / f"e2e_export_{download.suggested_filename}"
-    download.save_as(str(tmp_path))
-    content = tmp_path.read_text(encoding="utf-8")
-    assert '"type":"tx"' in content or '"type": "tx"' in content
+    # Playwright has already written the download to its own temp file;
+    # read that directly instead of copying it under tmp/ first.
+    content = download.path().read_bytes()
+    assert b'"type":"tx"' in content or b'"type": "tx"' in content
 
 
 def test_export_all_browser_labels_zip(r: E2ERunner) -> None:
-    section = r.label_files_section()
-    export_all_btn = section.get_by_role("button", name="Export all browser labels")
-    expect(export_all_btn).to_be_visible(timeout=5000)
-
     with r.page.expect_download(timeout=10000) as download_info:
-        export_all_btn.click()
+        r.export_all_button.click(timeout=5000)
 
     download = download_info.value
     assert download.suggested_filename == "labels.zip"
 
-    tmp_path = Path("tmp") / "e2e_export_all_browser_labels.zip"
-    download.save_as(str(tmp_path))
-
-    with zipfile.ZipFile(tmp_path, "r") as archive:
+    with zipfile.ZipFile(download.path(), "r") as archive:
         names = set(archive.namelist())
         assert "labels/test-labels.jsonl" in names
         assert "labels/e2e_import_fixture.jsonl" in names
 
-        import_content = archive.read("labels/e2e_import_fixture.jsonl").decode("utf-8")
-        assert "e2e-label-0" in import_content
-        assert "e2e-label-1" in import_content
+        import_content = archive.read("labels/e2e_import_fixture.jsonl")
+        assert b"e2e-label-0" in import_content
+        assert b"e2e-label-1" in import_content
 
 
 def test_remove_label_file(r: E2ERunner) -> None:
-    section = r.label_files_section()
-
-    def accept_dialog(dialog):
-        dialog.accept()
-
-    r.page.on("dialog", accept_dialog)
-    try:
-        test_labels_li = section.locator("li").filter(has_text="test-labels")
-        test_labels_li.get_by_role("button", name="Remove").click()
-        expect(test_labels_li).not_to_be_visible(timeout=5000)
-    finally:
-        r.page.remove_listener("dialog", accept_dialog)
+    # The runner's dialog handler accepts the removal confirm.
+    test_labels_li = r.label_file_item("test-labels")
+    test_labels_li.get_by_test_id("label-file-remove").click()
+    expect(test_labels_li).to_have_count(0, timeout=5000)
 
 
 def test_viewport_stable_on_create(r: E2ERunner) -> None:
     viewport = r.page.locator(".react-flow__viewport")
     expect(viewport).to_be_visible(timeout=10000)
 
-    transform_before = viewport.evaluate("el => el.style.transform || el.getAttribute('transform') || ''")
-    assert transform_before, "Could not read viewport transform"
+    def read_transform() -> str:
+        return viewport.evaluate("el => el.style.transform || el.getAttribute('transform') || ''")
 
-    section = r.label_files_section()
-    section.get_by_placeholder("New file name").fill("viewport-test")
-    section.get_by_role("button", name="Create").click()
-
-    r.page.wait_for_timeout(1000)
+    transform_before = read_transform()
+    assert transform_before, "Could not read viewport transform"
 
-    transform_after = viewport.evaluate("el => el.style.transform || el.getAttribute('transform') || ''")
-    assert transform_after, "Could not read viewport transform after create"
+    r.new_file_name_input.fill("viewport-test")
+    r.create_file_button.click()
+    li = r.label_file_item("viewport-test")
+    expect(li).to_be_visible(timeout=5000)
 
     # Creating a browser file can trigger a viewport refit due to layout changes.
-    # Validate that the transform settles and the graph remains visible.
-    r.page.wait_for_timeout(400)
-    transform_settled = viewport.evaluate("el => el.style.transform || el.getAttribute('transform') || ''")
-    assert transform_after == transform_settled, (
-        f"Viewport transform did not settle after create: {transform_after} -> {transform_settled}"
-    )
+    # Validate that the transform settles (to a non-empty value) and the
+    # graph remains visible.
+    r.wait_for_transform_settled(viewport)
 
     node = r.node_locator(r.root_txid())
     expect(node).to_be_visible(timeout=5000)
 
-    def accept_dialog(dialog):
-        dialog.accept()
-
-    r.page.on("dialog", accept_dialog)
-    try:
-        li = section.locator("li").filter(has_text="viewport-test")
-        li.get_by_role("button", name="Remove").click()
-        expect(li).not_to_be_visible(timeout=5000)
-    finally:
-        r.page.remove_listener("dialog", accept_dialog)
+    li.get_by_test_id("label-file-remove").click()
+    expect(li).to_have_count(0, timeout=5000)
 
 
 def test_drag_preserved_on_save(r: E2ERunner) -> None:
-    node = r.node_locator(r.root_txid())
+    txid = r.root_txid()
+    node = r.node_locator(txid)
 
-    box_before = node.bounding_box()
-    assert box_before is not None, "Could not get node bounding box"
+    box_before = r.node_rect(txid)
 
     node.hover()
     r.page.mouse.down()
     r.page.mouse.move(box_before["x"] + box_before["width"] / 2, box_before["y"] + 50)
     r.page.mouse.up()
 
-    r.page.wait_for_timeout(500)
-    box_after_drag = node.bounding_box()
-    assert box_after_drag is not None, "Could not get node bounding box after drag"
+    r.wait_for_drag_end()
+    box_after_drag = r.node_rect(txid)
 
     editor = r.selected_editor_section()
     add_btn = editor.get_by_title("Add label")
@@ -364,11 +311,12 @@ def test_drag_preserved_on_save(r: E2ERunner) -> None:
             current = inputs.first.input_value()
             inputs.first.fill(f"{current}-drag")
 
-    expect(editor.locator('span[title="saved"]').first).to_be_visible(timeout=10000)
-    r.page.wait_for_timeout(1200)
+    r.wait_for_autosave_settled(editor)
 
-    box_after_save = node.bounding_box()
-    assert box_after_save is not None, "Could not get node bounding box after save"
+    box_after_save = r.wait_for_stable(
+        lambda: r.node_rect(txid),
+        failure_message="Node position did not settle after save",
+    )
 
     dx = abs(box_after_save["x"] - box_after_drag["x"])
     dy = abs(box_after_save["y"] - box_after_drag["y"])
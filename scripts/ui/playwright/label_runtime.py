@@ -1,12 +1,55 @@
 from __future__ import annotations
 
+import functools
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, TypeVar
 
-from playwright.sync_api import Locator, Page, expect
+from playwright.sync_api import Dialog, Locator, Page, expect
 
+T = TypeVar("T")
+
+# Everything runs against cory and bitcoind on loopback, so no click, fill or
+# navigation legitimately needs Playwright's 30 s default; a broken case fails
+# in seconds instead. Genuinely slow waits (first graph render, downloads)
+# pass their own longer `timeout`.
+DEFAULT_ACTION_TIMEOUT_MS = 2500
+DEFAULT_NAVIGATION_TIMEOUT_MS = 5000
+
+# Everything `test_all_files_labeled_message` checks on a transaction card,
+# read in one DOM walk. Text matches mirror `get_by_text` (substring of a
+# visible text node); visibility uses the browser's own `checkVisibility`.
+TX_CARD_STATE_JS = """(card) => {
+    const visibleText = (text) => {
+        const walker = document.createTreeWalker(card, NodeFilter.SHOW_TEXT);
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            if (node.data.includes(text) && node.parentElement.checkVisibility()) return true;
+        }
+        return false;
+    };
+    const input = card.querySelector('input[placeholder="Label"]');
+    return {
+        message: visibleText("Labels already exist for all editable files."),
+        input: input !== null && input.checkVisibility(),
+        add: card.querySelector('[title="Add label"]') !== null,
+        no_more: visibleText("No additional editable files available."),
+    };
+}"""
+
+# Resolves to an element's transform once it has held one value for
+# `settleMs`. The last value and when it changed ride on the element itself,
+# so the predicate needs no Python-side state between animation frames.
+TRANSFORM_SETTLED_JS = """([el, settleMs]) => {
+    const value = el.style.transform || el.getAttribute("transform") || "";
+    const now = performance.now();
+    const last = el.__e2eTransform;
+    if (!last || last.value !== value) {
+        el.__e2eTransform = { value, since: now };
+        return false;
+    }
+    return value !== "" && now - last.since >= settleMs ? value : false;
+}"""
 
 # ==============================================================================
 # Test Runner Data
@@ -28,19 +71,41 @@ class E2ERunner:
     api_token: str
     scenarios: list[dict[str, Any]]
     results: list[TestResult] = field(default_factory=list)
+    _by_name: dict[str, dict[str, Any]] = field(init=False, repr=False)
+    _node_locators: dict[str, Locator] = field(init=False, default_factory=dict, repr=False)
+    _label_file_items: dict[str, Locator] = field(init=False, default_factory=dict, repr=False)
+    dialogs: list[str] = field(init=False, default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        # Scenario shortcuts are read on nearly every interaction; index them
+        # once instead of scanning the list each time.
+        self._by_name = {s["name"]: s for s in self.scenarios}
+        # One session-wide handler accepts every alert/confirm and records its
+        # message, so cases neither churn listeners nor race a dialog that
+        # fires before their own handler is attached. Cases clear `dialogs`
+        # before the action they want to observe.
+        self.page.on("dialog", self._accept_dialog)
+        self.page.set_default_timeout(DEFAULT_ACTION_TIMEOUT_MS)
+        self.page.set_default_navigation_timeout(DEFAULT_NAVIGATION_TIMEOUT_MS)
+
+    def _accept_dialog(self, dialog: Dialog) -> None:
+        self.dialogs.append(dialog.message)
+        dialog.accept()
 
     # --------------------------------------------------------------------------
     # Generic test harness helpers
     # --------------------------------------------------------------------------
     def run_test(self, name: str, fn) -> None:
-        start = time.monotonic()
+        # `perf_counter_ns` is the interval timer meant for this; integer
+        # nanoseconds keep the subtraction exact before the one conversion.
+        start = time.perf_counter_ns()
         try:
             fn()
-            elapsed = (time.monotonic() - start) * 1000
+            elapsed = (time.perf_counter_ns() - start) / 1_000_000
             self.results.append(TestResult(name=name, passed=True, duration_ms=elapsed))
             print(f"[PASS] {name} ({elapsed:.0f}ms)")
         except Exception as exc:
-            elapsed = (time.monotonic() - start) * 1000
+            elapsed = (time.perf_counter_ns() - start) / 1_000_000
             self.results.append(
                 TestResult(name=name, passed=False, duration_ms=elapsed, message=str(exc))
             )
@@ -60,11 +125,11 @@ class E2ERunner:
     # --------------------------------------------------------------------------
     @property
     def simple_chain(self) -> dict[str, Any]:
-        return next(s for s in self.scenarios if s["name"] == "simple_chain_4")
+        return self._by_name["simple_chain_4"]
 
     @property
     def diamond(self) -> dict[str, Any]:
-        return next(s for s in self.scenarios if s["name"] == "diamond_merge")
+        return self._by_name["diamond_merge"]
 
     def root_txid(self) -> str:
         return self.simple_chain["root_txid"]
@@ -72,37 +137,146 @@ class E2ERunner:
     # --------------------------------------------------------------------------
     # Page interaction helpers
     # --------------------------------------------------------------------------
+    # Locators are lazy queries that re-resolve on every action, so one
+    # instance per selector stays valid across navigations; building them
+    # once skips re-creating the selector objects on every interaction.
+    @functools.cached_property
+    def token_input(self) -> Locator:
+        return self.page.get_by_placeholder("paste token from terminal")
+
+    @functools.cached_property
+    def search_input(self) -> Locator:
+        return self.page.get_by_placeholder("Enter a txid to explore its spending ancestry...")
+
+    @functools.cached_property
+    def search_button(self) -> Locator:
+        # Matched on its exact title; history rows carry longer "Search txid
+        # <txid>" titles, and a role/name lookup would compute accessible
+        # names for every button on the page.
+        return self.page.get_by_title("Search txid", exact=True)
+
+    @functools.cached_property
+    def graph_stats(self) -> Locator:
+        # Anchored on the stats chip's test id; a page-wide text match would
+        # walk every graph node on each retry.
+        return self.page.get_by_test_id("graph-stats")
+
+    @functools.cached_property
+    def _label_files_section(self) -> Locator:
+        return self.page.locator('details:has(summary:has-text("Browser Labels"))')
+
+    # The file-creation form is driven by several cases; like the sections
+    # they live in, they are built once per session. Buttons are anchored on
+    # test ids, a plain attribute match, rather than `get_by_role`, which
+    # computes the accessible name of every button in scope.
+    @functools.cached_property
+    def new_file_name_input(self) -> Locator:
+        return self._label_files_section.get_by_placeholder("New file name")
+
+    @functools.cached_property
+    def create_file_button(self) -> Locator:
+        return self._label_files_section.get_by_test_id("label-file-create")
+
+    @functools.cached_property
+    def export_all_button(self) -> Locator:
+        return self._label_files_section.get_by_test_id("label-files-export-all")
+
+    @functools.cached_property
+    def _selected_editor_section(self) -> Locator:
+        return self.page.locator('details:has(summary:has-text("Selected Transaction Editor"))')
+
+    @functools.cached_property
+    def _selected_tx_card(self) -> Locator:
+        # Use stable card anchors from TargetLabelEditor instead of matching
+        # incidental text/structure in the editor section. The cases always
+        # select the simple chain root, so one card locator serves them all.
+        txid = self.root_txid()
+        return self._selected_editor_section.locator(
+            f'[data-testid="target-label-editor"][data-label-type="tx"][data-ref-id="{txid}"]'
+        )
+
+    # The transaction card's controls, shared by every case that edits it.
+    # Being lazy, they need no per-case invalidation: each action re-queries.
+    @functools.cached_property
+    def tx_add_label_button(self) -> Locator:
+        return self._selected_tx_card.get_by_title("Add label")
+
+    @functools.cached_property
+    def tx_new_label_input(self) -> Locator:
+        return self._selected_tx_card.get_by_placeholder("Label")
+
+    @functools.cached_property
+    def tx_all_labeled_message(self) -> Locator:
+        return self._selected_tx_card.get_by_text("Labels already exist for all editable files.")
+
     def ensure_api_token(self) -> None:
-        token_input = self.page.get_by_placeholder("paste token from terminal")
-        token_input.fill(self.api_token)
+        self.token_input.fill(self.api_token)
 
     def search_txid(self, txid: str) -> None:
-        search_input = self.page.get_by_placeholder("Enter a txid to explore its spending ancestry...")
-        search_input.fill(txid)
-        self.page.get_by_role("button", name="Search").click()
+        self.search_input.fill(txid)
+        self.search_button.click()
+
+    def node_rect(self, txid: str) -> dict[str, float]:
+        # A single in-page read; `bounding_box()` resolves the box model and
+        # frame offsets over several protocol calls, which adds up when a
+        # case polls a node's position until it settles.
+        return self.node_locator(txid).evaluate(
+            "el => { const b = el.getBoundingClientRect();"
+            " return {x: b.x, y: b.y, width: b.width, height: b.height}; }"
+        )
+
+    def wait_for_drag_end(self, *, timeout_ms: int = 5000) -> None:
+        # React Flow tags a node with `dragging` from drag start until the
+        # render that commits its final position, so the class going away is
+        # the drag-stop signal; no settle window is needed after it.
+        expect(self.page.locator(".react-flow__node.dragging")).to_have_count(0, timeout=timeout_ms)
 
     def node_locator(self, txid: str) -> Locator:
-        return self.page.locator(f'.react-flow__node[data-id="{txid}"]')
+        locator = self._node_locators.get(txid)
+        if locator is None:
+            locator = self.page.locator(f'.react-flow__node[data-id="{txid}"]')
+            self._node_locators[txid] = locator
+        return locator
 
     def label_files_section(self) -> Locator:
-        return self.page.locator('details:has(summary:has-text("Browser Labels"))')
+        return self._label_files_section
+
+    def label_file_item(self, name: str) -> Locator:
+        # The file list rows are looked up by name from several cases; like
+        # `node_locator`, one locator per name serves the whole session.
+        locator = self._label_file_items.get(name)
+        if locator is None:
+            locator = self._label_files_section.locator("li").filter(has_text=name)
+            self._label_file_items[name] = locator
+        return locator
 
     def selected_editor_section(self) -> Locator:
-        return self.page.locator('details:has(summary:has-text("Selected Transaction Editor"))')
+        return self._selected_editor_section
 
-    def is_visible(self, locator: Locator) -> bool:
-        return locator.count() > 0 and locator.first.is_visible()
+    def label_input(self, container: Locator, value: str) -> Locator:
+        # Saved label rows mirror their draft into `data-label-value`, so the
+        # browser resolves the match in one selector instead of the driver
+        # reading every input's value.
+        return container.locator(f'input[data-label-value="{value}"]')
 
     def selected_tx_card(self) -> Locator:
-        # Use stable card anchors from TargetLabelEditor instead of matching
-        # incidental text/structure in the editor section.
-        txid = self.root_txid()
-        card = self.selected_editor_section().locator(
-            f'[data-testid="target-label-editor"][data-label-type="tx"][data-ref-id="{txid}"]'
-        )
+        card = self._selected_tx_card
         expect(card).to_be_visible(timeout=5000)
         return card
 
+    def tx_card_state(self, card: Locator) -> dict[str, bool]:
+        # One round-trip per decision instead of a count plus visibility
+        # check for each of the four controls.
+        return card.evaluate(TX_CARD_STATE_JS)
+
+    def wait_for_autosave_settled(self, container: Locator, *, timeout_ms: int = 5000) -> None:
+        # A `saved` indicator alone can belong to another row; settled means
+        # no row under `container` is still `dirty` or `saving`.
+        expect(container.locator('span[title="saved"]').first).to_be_visible(timeout=timeout_ms)
+        expect(container.locator('span[title="dirty"], span[title="saving"]')).to_have_count(
+            0, timeout=timeout_ms
+        )
+
     def wait_until(
         self,
         predicate: Callable[[], bool],
@@ -113,6 +287,9 @@ class E2ERunner:
     ) -> None:
         # Central polling utility so tests can model async UI state transitions
         # with explicit failure messages instead of scattered sleep calls.
+        # The pause is `page.wait_for_timeout`, not `time.sleep`: the sync API
+        # only dispatches page events such as dialogs while it is waiting on
+        # the driver, and predicates like "an alert was recorded" need them.
         steps = max(1, timeout_ms // step_ms)
         for _ in range(steps):
             if predicate():
@@ -120,6 +297,46 @@ class E2ERunner:
             self.page.wait_for_timeout(step_ms)
         assert False, failure_message
 
+    def wait_for_transform_settled(
+        self, locator: Locator, *, settle_ms: int = 300, timeout_ms: int = 10000
+    ) -> str:
+        # Viewport refits are CSS transform changes, so the browser can check
+        # them itself on every animation frame instead of the driver polling
+        # a read every `step_ms`.
+        handle = self.page.wait_for_function(
+            TRANSFORM_SETTLED_JS,
+            arg=[locator.element_handle(), settle_ms],
+            polling="raf",
+            timeout=timeout_ms,
+        )
+        return handle.json_value()
+
+    def wait_for_stable(
+        self,
+        read: Callable[[], T],
+        *,
+        settle_ms: int = 300,
+        timeout_ms: int = 10000,
+        step_ms: int = 100,
+        failure_message: str,
+    ) -> T:
+        # Layout effects (refits, drag release, post-save rerenders) have no
+        # DOM event to wait on; instead of sleeping for a worst-case delay,
+        # return as soon as `read()` has held one value for `settle_ms`.
+        settle_steps = max(1, settle_ms // step_ms)
+        value = read()
+        unchanged = 0
+        for _ in range(max(1, timeout_ms // step_ms)):
+            self.page.wait_for_timeout(step_ms)
+            current = read()
+            if current == value:
+                unchanged += 1
+                if unchanged >= settle_steps:
+                    return current
+            else:
+                value, unchanged = current, 0
+        assert False, failure_message
+
 
 def fixture_path() -> Path:
     return Path("tmp") / "e2e_import_fixture.jsonl"